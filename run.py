@@ -1,12 +1,13 @@
 #!/usr/bin/env python3
 """Entry point for the Squishy application."""
 
-import os
-import logging
-import eventlet
+from gevent import monkey
 
-# Patch stdlib for eventlet/WebSocket support
-eventlet.monkey_patch()
+# Patch stdlib for gevent/WebSocket support before anything else is imported
+monkey.patch_all()
+
+import os  # noqa: E402
+import logging  # noqa: E402
 
 from squishy.app import main  # noqa
 
@@ -23,5 +24,5 @@ if __name__ == "__main__":
         format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
     )
 
-    # Start the app
-    main()
+    # Start the app with the already loaded config
+    main(config)
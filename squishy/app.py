@@ -2,21 +2,72 @@
 
 import os
 import logging
+import orjson
 from flask import Flask, redirect, url_for, request, session
+from flask.json.provider import DefaultJSONProvider
+from flask_compress import Compress
 from flask_socketio import SocketIO
+from jinja2 import ChoiceLoader, ModuleLoader
 
 from squishy.config import load_config, Config, is_first_run
-from squishy.blueprints.api import api_bp
-from squishy.blueprints.ui import ui_bp
-from squishy.blueprints.admin import admin_bp
-from squishy.blueprints.onboarding import onboarding_bp
-from squishy import scanner
 
 # Initialize SocketIO globally
 socketio = SocketIO()
 
+# Response compression for JSON and page responses
+compress = Compress()
+
+# Set once onboarding has produced a media server config; it never flips back
+_first_run_cached = None
+
+# Paths that never redirect to onboarding (socket.io must stay reachable for the handshake)
+_SKIP_PREFIXES = ('/static', '/onboarding', '/api', '/socket.io')
+
+# Set once onboarding is finished, after which check_first_run has nothing to do
+_onboarding_completed = False
+
+class ORJSONProvider(DefaultJSONProvider):
+    """JSON provider that encodes and decodes with orjson."""
+
+    def dumps(self, obj, **kwargs):
+        # Datetimes go through Flask's default handler to keep HTTP date formatting
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        if kwargs.get("indent"):
+            option |= orjson.OPT_INDENT_2
+        if kwargs.get("sort_keys", self.sort_keys):
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, default=self.default, option=option).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+# Directories already created by this process
+_ensured_dirs = set()
+
+def ensure_dir(path: str):
+    """Create a directory once per process, skipping paths already ensured."""
+    if path in _ensured_dirs:
+        return
+    os.makedirs(path, exist_ok=True)
+    _ensured_dirs.add(path)
+
+def use_compiled_templates(app: Flask):
+    """Precompile all templates and serve them from the compiled archive."""
+    target = os.path.join(app.instance_path, "compiled_templates.zip")
+    try:
+        ensure_dir(app.instance_path)
+        app.jinja_env.compile_templates(target, zip="deflated")
+    except Exception as e:
+        logging.warning(f"Could not precompile templates, using template sources: {e}")
+        return
+
+    # Anything missing from the archive still falls back to the source templates
+    app.jinja_env.loader = ChoiceLoader([ModuleLoader(target), app.jinja_env.loader])
+
 def perform_initial_scan(config: Config):
     """Perform initial scan of media if Jellyfin or Plex is configured."""
+    from squishy import scanner
+
     if config.jellyfin_url and config.jellyfin_api_key:
         logging.debug("Jellyfin configuration found. Starting initial scan in background...")
         scanner.scan_jellyfin_async(config.jellyfin_url, config.jellyfin_api_key)
@@ -26,12 +77,14 @@ def perform_initial_scan(config: Config):
     else:
         logging.warning("No media server configuration found. Please configure Jellyfin or Plex to use Squishy.")
 
-def create_app(test_config=None):
+def create_app(test_config=None, config: Config = None):
     """Create and configure the Flask application."""
     app = Flask(__name__)
+    app.json = ORJSONProvider(app)
 
-    # Load configuration from config file
-    config = load_config()
+    # Load configuration from config file unless the caller already did
+    if config is None:
+        config = load_config()
 
     # Load default configuration
     app.config.from_mapping(
@@ -41,7 +94,22 @@ def create_app(test_config=None):
     )
     
     # Disable template caching in development mode
-    app.config['TEMPLATES_AUTO_RELOAD'] = True
+    debug = os.environ.get("DEBUG", "False").lower() == "true"
+    app.config['TEMPLATES_AUTO_RELOAD'] = debug
+
+    # Let browsers cache static assets instead of revalidating on every page.
+    # Asset names are not hashed, so keep the default short.
+    app.config['SEND_FILE_MAX_AGE_DEFAULT'] = int(os.environ.get('STATIC_MAX_AGE', 3600))
+
+    # Behind a front end that honours X-Sendfile (Apache mod_xsendfile,
+    # lighttpd), let it serve downloads with sendfile(2) instead of Python
+    app.config['USE_X_SENDFILE'] = os.environ.get('USE_X_SENDFILE', 'False').lower() == 'true'
+
+    # Compress responses large enough to benefit; streamed JSON is compressed
+    # chunk by chunk, while text/event-stream is left alone
+    app.config['COMPRESS_ALGORITHM'] = ['br', 'gzip']
+    app.config['COMPRESS_MIN_SIZE'] = 2048
+    app.config['COMPRESS_LEVEL'] = 5
 
     # Load test configuration if provided
     if test_config is not None:
@@ -49,18 +117,36 @@ def create_app(test_config=None):
 
     # Ensure the transcode folder exists
     try:
-        os.makedirs(app.config["TRANSCODE_PATH"], exist_ok=True)
+        ensure_dir(app.config["TRANSCODE_PATH"])
     except OSError:
         pass
 
+    # Import blueprints here so importing squishy.app stays cheap
+    from squishy.blueprints.api import api_bp
+    from squishy.blueprints.ui import ui_bp
+    from squishy.blueprints.admin import admin_bp
+    from squishy.blueprints.onboarding import onboarding_bp
+
     # Register blueprints
     app.register_blueprint(api_bp, url_prefix="/api")
     app.register_blueprint(ui_bp)
     app.register_blueprint(admin_bp, url_prefix="/admin")
     app.register_blueprint(onboarding_bp, url_prefix="/onboarding")
+
+    # Outside development, skip Jinja parsing by loading precompiled templates
+    if not debug and not test_config:
+        use_compiled_templates(app)
     
-    # Initialize SocketIO with the app
-    socketio.init_app(app, cors_allowed_origins="*", async_mode="eventlet")
+    compress.init_app(app)
+
+    # Initialize SocketIO with the app. Setting SOCKETIO_MQ_URL (e.g. redis://...)
+    # lets several workers share broadcasts; unset keeps the single-worker setup
+    socketio.init_app(
+        app,
+        cors_allowed_origins="*",
+        async_mode="gevent",
+        message_queue=os.environ.get("SOCKETIO_MQ_URL"),
+    )
     
     # Import socket events after socketio initialization to avoid circular imports
     from squishy import socket_events  # noqa
@@ -68,20 +154,25 @@ def create_app(test_config=None):
     # Add a before_request handler to check if this is the first run
     @app.before_request
     def check_first_run():
-        # Skip for onboarding and static routes
-        if request.path.startswith('/static') or request.path.startswith('/onboarding'):
+        global _first_run_cached, _onboarding_completed
+        if _onboarding_completed:
             return None
-            
-        # Skip for API routes as well
-        if request.path.startswith('/api'):
+
+        # Skip for onboarding, static, API and socket.io routes
+        if request.path.startswith(_SKIP_PREFIXES):
             return None
-            
-        # If socket.io connections, allow them
-        if request.path.startswith('/socket.io'):
+
+        # Only page loads are redirected; redirecting a POST would drop its data
+        if request.method not in ('GET', 'HEAD'):
             return None
             
         # If it's the first run or we're in an onboarding process and not already on the onboarding page, redirect
-        first_run = is_first_run()
+        if _first_run_cached is False:
+            first_run = False
+        else:
+            first_run = is_first_run()
+            if not first_run:
+                _first_run_cached = False
         onboarding_active = 'onboarding_in_progress' in session and session.get('onboarding_in_progress')
         
         # Clear onboarding flag if first_run is false but session still has the flag
@@ -95,8 +186,11 @@ def create_app(test_config=None):
             # clear it (configuration must have been saved manually)
             if has_jellyfin or has_plex:
                 session.pop('onboarding_in_progress', None)
-                session.modified = True
                 onboarding_active = False
+
+        if not first_run and not onboarding_active:
+            _onboarding_completed = True
+            return None
         
         # Redirect to onboarding if needed
         if (first_run or onboarding_active) and not request.path.startswith('/onboarding'):
@@ -104,21 +198,23 @@ def create_app(test_config=None):
             
         return None
 
-    # Perform initial scan if media server is configured and not in first run
+    # Start the initial scan in the background if a media server is configured and not in first run
     if not test_config and not is_first_run():  # Skip scan during testing or first run
-        perform_initial_scan(config)
+        socketio.start_background_task(perform_initial_scan, config)
 
     return app
 
-def main():
+def main(config: Config = None):
     """Run the application."""
-    # Logging is configured in run.py, but update here in case app.py is run directly
-    config = load_config()
-    log_level = os.environ.get('LOG_LEVEL', config.log_level).upper()
-    logging.getLogger().setLevel(getattr(logging, log_level))
+    # Logging is configured in run.py, which passes its config through; only
+    # resolve it here when app.py is run directly
+    if config is None:
+        config = load_config()
+        log_level = os.environ.get('LOG_LEVEL', config.log_level).upper()
+        logging.getLogger().setLevel(getattr(logging, log_level))
     
     # Create Flask app
-    app = create_app()
+    app = create_app(config=config)
 
     # Run with SocketIO instead of Flask's built-in server
     socketio.run(app, host="0.0.0.0", port=5101, debug=os.environ.get("DEBUG", "False").lower() == "true")
@@ -1,8 +1,14 @@
 """Admin blueprint for Squishy."""
 
 import os
-import json
-import requests
+import shutil
+import stat
+import logging
+import time
+import functools
+import threading
+
+import orjson
 from flask import (
     Blueprint,
     render_template,
@@ -12,10 +18,18 @@ from flask import (
     current_app,
     flash,
     jsonify,
+    g,
+    Response,
 )
 
-from squishy.config import load_config, save_config
-from squishy.scanner import scan_jellyfin_async, scan_plex_async
+from squishy.config import load_config, save_config, save_config_async
+from squishy.effeffmpeg import detect_capabilities, validate_presets_data
+from squishy.scanner import (
+    HTTP_SESSION,
+    clear_media,
+    scan_jellyfin_async,
+    scan_plex_async,
+)
 from squishy.transcoder import (
     detect_hw_accel,
     process_job_queue,
@@ -26,6 +40,40 @@ from squishy.transcoder import (
 
 admin_bp = Blueprint("admin", __name__)
 
+# Log level names accepted by update_log_level
+_LOG_LEVELS = {
+    "DEBUG": logging.DEBUG,
+    "INFO": logging.INFO,
+    "WARNING": logging.WARNING,
+    "ERROR": logging.ERROR,
+    "CRITICAL": logging.CRITICAL,
+}
+
+# (connect, read) timeout for media server calls made while serving a page
+_HTTP_TIMEOUT = (2, 5)
+
+# Executable names shown by the file browser when picking an ffmpeg path
+_EXE_NAMES = frozenset(("ffmpeg", "ffmpeg.exe", "ffprobe", "ffprobe.exe"))
+
+# Library listings from the media server: (url, token) -> (expires_at, libraries)
+_LIBRARIES_TTL = 60
+_LIBRARIES_CACHE = {}
+_LIBRARIES_CACHE_LOCK = threading.Lock()
+
+# Preset template directories (local copy in Squishy and the effeffmpeg package)
+_HERE = os.path.dirname(os.path.abspath(__file__))
+_LOCAL_PRESET_DIR = os.path.normpath(os.path.join(_HERE, "..", "presets"))
+_PACKAGE_PRESET_DIR = os.path.normpath(
+    os.path.join(_HERE, "..", "..", "effeffmpeg", "presets")
+)
+
+
+def _get_config():
+    """Load the config once per request and share it between callers."""
+    if "config" not in g:
+        g.config = load_config()
+    return g.config
+
 
 codecs = [
     {"value": "h264", "label": "H.264 (AVC)"},
@@ -68,7 +116,7 @@ audio_bitrates = [
 @admin_bp.route("/")
 def index():
     """Admin dashboard."""
-    config = load_config()
+    config = _get_config()
 
     # Get hardware capabilities from config
     capabilities_json = config.hw_capabilities
@@ -87,7 +135,7 @@ def index():
 def scan():
     """Scan for media files from media server."""
     scan_type = request.form["scan_type"]
-    config = load_config()
+    config = _get_config()
 
     if scan_type == "jellyfin" and config.jellyfin_url and config.jellyfin_api_key:
         scan_jellyfin_async(config.jellyfin_url, config.jellyfin_api_key)
@@ -103,101 +151,114 @@ def scan():
     return redirect(url_for("admin.index"))
 
 
-@admin_bp.route("/presets")
-def list_presets():
-    """List transcoding presets."""
-    config = load_config()
+def _dir_mtime(path):
+    """Return a directory's mtime, or None if it isn't a directory."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns if stat.S_ISDIR(st.st_mode) else None
 
-    # Check if any effeffmpeg preset templates are available
+
+@functools.lru_cache(maxsize=4)
+def _scan_preset_templates(local_mtime, package_mtime):
+    """Collect preset template files; the mtimes only serve as the cache key."""
     # Use a dictionary to ensure we don't have duplicates
     preset_templates_dict = {}
 
-    # Check for the presets directory in effeffmpeg (local copy in Squishy)
-    effeff_preset_dir = os.path.join(
-        os.path.dirname(os.path.abspath(__file__)), "..", "presets"
-    )
-    if os.path.isdir(effeff_preset_dir):
-        for filename in os.listdir(effeff_preset_dir):
-            if filename.endswith(".json"):
-                preset_name = os.path.splitext(filename)[0]
-                # Clean up the name for display
-                display_name = preset_name.replace("-", " ").title()
-                # Prefer the local copy if it exists
-                preset_templates_dict[filename] = {
-                    "file_path": os.path.join(effeff_preset_dir, filename),
-                    "name": preset_name,
-                    "display_name": display_name,
-                }
-
-    # Also check in the original effeffmpeg package
-    # Only add if not already found in the local directory
-    package_preset_dir = os.path.join(
-        os.path.dirname(os.path.abspath(__file__)), "..", "..", "effeffmpeg", "presets"
-    )
-    if os.path.isdir(package_preset_dir):
-        for filename in os.listdir(package_preset_dir):
+    # Local copy in Squishy first, then the original effeffmpeg package.
+    # Only add package presets if not already found in the local directory
+    for preset_dir, mtime in (
+        (_LOCAL_PRESET_DIR, local_mtime),
+        (_PACKAGE_PRESET_DIR, package_mtime),
+    ):
+        if mtime is None:
+            continue
+        for filename in os.listdir(preset_dir):
             if filename.endswith(".json") and filename not in preset_templates_dict:
                 preset_name = os.path.splitext(filename)[0]
                 # Clean up the name for display
                 display_name = preset_name.replace("-", " ").title()
                 preset_templates_dict[filename] = {
-                    "file_path": os.path.join(package_preset_dir, filename),
+                    "file_path": os.path.join(preset_dir, filename),
                     "name": preset_name,
                     "display_name": display_name,
                 }
 
     # Convert dictionary to list for the template
-    preset_templates = list(preset_templates_dict.values())
+    return list(preset_templates_dict.values())
+
+
+@admin_bp.route("/presets")
+def list_presets():
+    """List transcoding presets."""
+    config = _get_config()
+
+    preset_templates = _scan_preset_templates(
+        _dir_mtime(_LOCAL_PRESET_DIR), _dir_mtime(_PACKAGE_PRESET_DIR)
+    )
 
     return render_template(
         "admin/presets.html", presets=config.presets, preset_templates=preset_templates
     )
 
 
+# Preset form fields copied as-is, and checkbox fields stored as booleans
+_PRESET_FIELDS = ("codec", "scale", "container", "audio_codec", "audio_bitrate")
+_PRESET_BOOLS = ("force_software", "allow_fallback")
+
+
+def _build_preset_from_form(form):
+    """Build a preset dictionary from the add/edit preset form."""
+    preset = {key: form[key] for key in _PRESET_FIELDS}
+    # Hardware acceleration settings
+    preset.update({key: form.get(key) == "on" for key in _PRESET_BOOLS})
+
+    # Add either CRF or bitrate
+    if form.get("use_crf", "false") == "true":
+        preset["crf"] = int(form["crf"])
+    elif form["bitrate"]:
+        preset["bitrate"] = form["bitrate"]
+
+    return preset
+
+
+def _load_preset_json(source):
+    """Load and validate presets from an uploaded file or a template file path."""
+    if isinstance(source, str):
+        with open(source, "rb") as f:
+            preset_data = orjson.loads(f.read())
+    else:
+        preset_data = orjson.loads(source.read())
+
+    presets = preset_data.get("presets", {})
+    validate_presets_data(presets)
+    return presets
+
+
+def _apply_import(config, presets, merge_mode):
+    """Merge or replace the configured presets with imported ones."""
+    if merge_mode == "merge":
+        # Merge presets (keeping existing ones if they conflict)
+        for name, preset in presets.items():
+            if name not in config.presets:
+                config.presets[name] = preset
+        flash(f"Imported {len(presets)} presets (merged with existing)")
+    else:
+        # Overwrite presets
+        config.presets = presets
+        flash(f"Imported {len(presets)} presets (replaced existing)")
+
+
 @admin_bp.route("/presets/add", methods=["GET", "POST"])
 def add_preset():
     """Add a new transcoding preset."""
     if request.method == "POST":
         name = request.form["name"]
-        codec = request.form["codec"]
-        scale = request.form["scale"]
-        container = request.form["container"]
-
-        # Get quality settings (either CRF or bitrate)
-        use_crf = request.form.get("use_crf", "false") == "true"
-        if use_crf:
-            crf = int(request.form["crf"])
-            bitrate = None
-        else:
-            crf = None
-            bitrate = request.form["bitrate"]
-
-        audio_codec = request.form["audio_codec"]
-        audio_bitrate = request.form["audio_bitrate"]
-
-        # Hardware acceleration settings
-        force_software = request.form.get("force_software") == "on"
-        allow_fallback = request.form.get("allow_fallback") == "on"
-
-        # Create the preset dictionary
-        preset = {
-            "codec": codec,
-            "scale": scale,
-            "container": container,
-            "audio_codec": audio_codec,
-            "audio_bitrate": audio_bitrate,
-            "force_software": force_software,
-            "allow_fallback": allow_fallback,
-        }
-
-        # Add either CRF or bitrate
-        if use_crf and crf is not None:
-            preset["crf"] = crf
-        elif bitrate:
-            preset["bitrate"] = bitrate
+        preset = _build_preset_from_form(request.form)
 
         # Add to config and save
-        config = load_config()
+        config = _get_config()
         config.presets[name] = preset
         save_config(config)
 
@@ -219,50 +280,14 @@ def add_preset():
 @admin_bp.route("/presets/<name>/edit", methods=["GET", "POST"])
 def edit_preset(name):
     """Edit a transcoding preset."""
-    config = load_config()
-    if name not in config.presets:
+    config = _get_config()
+    preset = config.presets.get(name)
+    if preset is None:
         flash(f"Preset {name} not found")
         return redirect(url_for("admin.list_presets"))
 
-    preset = config.presets[name]
-
     if request.method == "POST":
-        codec = request.form["codec"]
-        scale = request.form["scale"]
-        container = request.form["container"]
-
-        # Get quality settings (either CRF or bitrate)
-        use_crf = request.form.get("use_crf", "false") == "true"
-        if use_crf:
-            crf = int(request.form["crf"])
-            bitrate = None
-        else:
-            crf = None
-            bitrate = request.form["bitrate"]
-
-        audio_codec = request.form["audio_codec"]
-        audio_bitrate = request.form["audio_bitrate"]
-
-        # Hardware acceleration settings
-        force_software = request.form.get("force_software") == "on"
-        allow_fallback = request.form.get("allow_fallback") == "on"
-
-        # Update the preset
-        preset = {
-            "codec": codec,
-            "scale": scale,
-            "container": container,
-            "audio_codec": audio_codec,
-            "audio_bitrate": audio_bitrate,
-            "force_software": force_software,
-            "allow_fallback": allow_fallback,
-        }
-
-        # Add either CRF or bitrate
-        if use_crf and crf is not None:
-            preset["crf"] = crf
-        elif bitrate:
-            preset["bitrate"] = bitrate
+        preset = _build_preset_from_form(request.form)
 
         # Update config
         config.presets[name] = preset
@@ -290,7 +315,7 @@ def edit_preset(name):
 @admin_bp.route("/presets/<name>/delete", methods=["POST"])
 def delete_preset(name):
     """Delete a transcoding preset."""
-    config = load_config()
+    config = _get_config()
     if name not in config.presets:
         flash(f"Preset {name} not found")
         return redirect(url_for("admin.list_presets"))
@@ -307,79 +332,27 @@ def import_presets():
     """Import presets from a file."""
     if "preset_file" in request.files:
         # Import from user-uploaded file
-        preset_file = request.files["preset_file"]
-        if preset_file.filename == "":
+        source = request.files["preset_file"]
+        if source.filename == "":
             flash("No file selected")
             return redirect(url_for("admin.list_presets"))
+    elif "template_file" in request.form:
+        # Import from a template file
+        source = request.form["template_file"]
+    else:
+        source = None
 
+    if source is not None:
         try:
-            preset_data = json.load(preset_file)
-            presets = preset_data.get("presets", {})
-
-            # Validate presets
-            from squishy.effeffmpeg import validate_presets_data
-
-            validate_presets_data(presets)
+            presets = _load_preset_json(source)
 
             # Update config with new presets
-            config = load_config()
-
-            # Check if we should overwrite or merge
-            merge_mode = request.form.get("merge_mode", "overwrite")
-
-            if merge_mode == "merge":
-                # Merge presets (keeping existing ones if they conflict)
-                for name, preset in presets.items():
-                    if name not in config.presets:
-                        config.presets[name] = preset
-                flash(f"Imported {len(presets)} presets (merged with existing)")
-            else:
-                # Overwrite presets
-                config.presets = presets
-                flash(f"Imported {len(presets)} presets (replaced existing)")
-
+            config = _get_config()
+            _apply_import(config, presets, request.form.get("merge_mode", "overwrite"))
             save_config(config)
-            return redirect(url_for("admin.list_presets"))
         except Exception as e:
             flash(f"Error importing presets: {str(e)}")
-            return redirect(url_for("admin.list_presets"))
-
-    elif "template_file" in request.form:
-        # Import from a template file
-        template_path = request.form["template_file"]
-
-        try:
-            with open(template_path, "r") as f:
-                preset_data = json.load(f)
-                presets = preset_data.get("presets", {})
-
-                # Validate presets
-                from squishy.effeffmpeg import validate_presets_data
-
-                validate_presets_data(presets)
-
-                # Update config with new presets
-                config = load_config()
-
-                # Check if we should overwrite or merge
-                merge_mode = request.form.get("merge_mode", "overwrite")
-
-                if merge_mode == "merge":
-                    # Merge presets (keeping existing ones if they conflict)
-                    for name, preset in presets.items():
-                        if name not in config.presets:
-                            config.presets[name] = preset
-                    flash(f"Imported {len(presets)} presets (merged with existing)")
-                else:
-                    # Overwrite presets
-                    config.presets = presets
-                    flash(f"Imported {len(presets)} presets (replaced existing)")
-
-                save_config(config)
-                return redirect(url_for("admin.list_presets"))
-        except Exception as e:
-            flash(f"Error importing presets: {str(e)}")
-            return redirect(url_for("admin.list_presets"))
+        return redirect(url_for("admin.list_presets"))
 
     flash("No preset file specified")
     return redirect(url_for("admin.list_presets"))
@@ -388,23 +361,29 @@ def import_presets():
 @admin_bp.route("/presets/export", methods=["GET"])
 def export_presets():
     """Export presets to a JSON file."""
-    config = load_config()
-
-    # Create a JSON object with the presets
-    export_data = {"presets": config.presets}
-
-    # Create the response with the JSON data
-    response = jsonify(export_data)
-    response.headers["Content-Disposition"] = (
-        "attachment; filename=squishy-presets.json"
+    presets = _get_config().presets
+
+    # Stream {"presets": {...}} one preset at a time instead of buffering it all
+    def generate():
+        yield b'{"presets":{'
+        for i, name in enumerate(sorted(presets)):
+            if i:
+                yield b","
+            yield orjson.dumps(name) + b":"
+            yield orjson.dumps(presets[name], option=orjson.OPT_SORT_KEYS)
+        yield b"}}\n"
+
+    return Response(
+        generate(),
+        mimetype="application/json",
+        headers={"Content-Disposition": "attachment; filename=squishy-presets.json"},
     )
-    return response
 
 
 @admin_bp.route("/update_source", methods=["POST"])
 def update_source():
     """Update the media source configuration."""
-    config = load_config()
+    config = _get_config()
     source = request.form["source"]
 
     # Reset all source configurations
@@ -424,7 +403,7 @@ def update_source():
         flash("You must configure either Jellyfin or Plex to use Squishy")
         return redirect(url_for("admin.index"))
 
-    save_config(config)
+    save_config_async(config)
     flash(f"Media source updated to {source}")
     return redirect(url_for("admin.index"))
 
@@ -432,7 +411,7 @@ def update_source():
 @admin_bp.route("/update_paths", methods=["POST"])
 def update_paths():
     """Update the media path and transcode path configuration."""
-    config = load_config()
+    config = _get_config()
 
     # Get media path
     media_path = request.form["media_path"].strip()
@@ -444,7 +423,7 @@ def update_paths():
     config.media_path = media_path
     config.transcode_path = transcode_path
 
-    save_config(config)
+    save_config_async(config)
     flash("Path configuration updated")
     return redirect(url_for("admin.index"))
 
@@ -461,22 +440,25 @@ def browse_filesystem():
         path = "/"
 
     try:
-        # Get entries in the specified path
-        entries = os.listdir(path)
         directories = []
         files = []
 
-        for entry in entries:
-            if entry.startswith("."):
-                continue
-
-            full_path = os.path.join(path, entry)
-            if os.path.isdir(full_path):
-                directories.append(entry)
-            elif file_type == "file" and os.path.isfile(full_path):
-                # For ffmpeg path, we want to show executable files
-                if entry == "ffmpeg" or entry.endswith(".exe"):
-                    files.append(entry)
+        # Get entries in the specified path; DirEntry types come from the
+        # directory listing, so only symlinks need an extra stat
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if entry.name.startswith("."):
+                    continue
+
+                if entry.is_dir():
+                    directories.append(entry.name)
+                elif (
+                    file_type == "file"
+                    # For ffmpeg path, we want to show executable files
+                    and (entry.name in _EXE_NAMES or entry.name.endswith(".exe"))
+                    and entry.is_file()
+                ):
+                    files.append(entry.name)
 
         # Sort entries alphabetically
         directories.sort()
@@ -487,72 +469,112 @@ def browse_filesystem():
         return jsonify({"error": f"Could not access directory: {str(e)}"}), 400
 
 
+def _fetch_libraries(config):
+    """Fetch libraries from the media server, or None if the request failed."""
+    libraries = []
+
+    if config.plex_url and config.plex_token:
+        # Get Plex libraries
+        headers = {
+            "X-Plex-Token": config.plex_token,
+            "Accept": "application/json",
+        }
+        response = HTTP_SESSION.get(
+            f"{config.plex_url}/library/sections",
+            headers=headers,
+            timeout=_HTTP_TIMEOUT,
+        )
+        if response.status_code != 200:
+            return None
+
+        data = response.json()
+        sections = data.get("MediaContainer", {}).get("Directory", [])
+
+        for section in sections:
+            section_id = section.get("key")
+            if section_id:
+                libraries.append(
+                    {
+                        "id": section_id,
+                        "title": section.get("title", "Unknown"),
+                        "type": section.get("type", "unknown"),
+                        "server": "plex",
+                    }
+                )
+
+    elif config.jellyfin_url and config.jellyfin_api_key:
+        # Get Jellyfin libraries
+        headers = {
+            "X-MediaBrowser-Token": config.jellyfin_api_key,
+            "Content-Type": "application/json",
+        }
+        response = HTTP_SESSION.get(
+            f"{config.jellyfin_url}/Library/VirtualFolders",
+            headers=headers,
+            timeout=_HTTP_TIMEOUT,
+        )
+        if response.status_code != 200:
+            return None
+
+        sections = response.json()
+
+        for section in sections:
+            section_id = section.get("ItemId")
+            if section_id:
+                libraries.append(
+                    {
+                        "id": section_id,
+                        "title": section.get("Name", "Unknown"),
+                        "type": section.get("CollectionType", "unknown").lower(),
+                        "server": "jellyfin",
+                    }
+                )
+
+    return libraries
+
+
+def _get_libraries(config, refresh=False):
+    """Return the media server's libraries, cached for a short TTL."""
+    if config.plex_url and config.plex_token:
+        key = (config.plex_url, config.plex_token)
+    else:
+        key = (config.jellyfin_url, config.jellyfin_api_key)
+
+    now = time.monotonic()
+    if not refresh:
+        with _LIBRARIES_CACHE_LOCK:
+            cached = _LIBRARIES_CACHE.get(key)
+        if cached is not None and cached[0] > now:
+            return cached[1]
+
+    libraries = _fetch_libraries(config)
+    if libraries is None:
+        return []
+
+    with _LIBRARIES_CACHE_LOCK:
+        _LIBRARIES_CACHE[key] = (now + _LIBRARIES_TTL, libraries)
+    return libraries
+
+
+def _clear_libraries_cache():
+    """Forget cached library listings."""
+    with _LIBRARIES_CACHE_LOCK:
+        _LIBRARIES_CACHE.clear()
+
+
 @admin_bp.route("/api/libraries")
 def list_libraries():
     """List all available libraries from the configured media server."""
-    config = load_config()
-    libraries = []
+    config = _get_config()
 
     try:
-        if config.plex_url and config.plex_token:
-            # Get Plex libraries
-            headers = {
-                "X-Plex-Token": config.plex_token,
-                "Accept": "application/json",
-            }
-            response = requests.get(
-                f"{config.plex_url}/library/sections", headers=headers
-            )
-
-            if response.status_code == 200:
-                data = response.json()
-                sections = data.get("MediaContainer", {}).get("Directory", [])
-
-                for section in sections:
-                    section_id = section.get("key")
-                    if section_id:
-                        libraries.append(
-                            {
-                                "id": section_id,
-                                "title": section.get("title", "Unknown"),
-                                "type": section.get("type", "unknown"),
-                                "enabled": config.enabled_libraries.get(
-                                    section_id, True
-                                ),
-                                "server": "plex",
-                            }
-                        )
-
-        elif config.jellyfin_url and config.jellyfin_api_key:
-            # Get Jellyfin libraries
-            headers = {
-                "X-MediaBrowser-Token": config.jellyfin_api_key,
-                "Content-Type": "application/json",
-            }
-            response = requests.get(
-                f"{config.jellyfin_url}/Library/VirtualFolders", headers=headers
-            )
-
-            if response.status_code == 200:
-                sections = response.json()
-
-                for section in sections:
-                    section_id = section.get("ItemId")
-                    if section_id:
-                        libraries.append(
-                            {
-                                "id": section_id,
-                                "title": section.get("Name", "Unknown"),
-                                "type": section.get(
-                                    "CollectionType", "unknown"
-                                ).lower(),
-                                "enabled": config.enabled_libraries.get(
-                                    section_id, True
-                                ),
-                                "server": "jellyfin",
-                            }
-                        )
+        libraries = _get_libraries(config, refresh=request.args.get("refresh") == "1")
 
+        # Enabled state comes from the current config, not the cached listing
+        libraries = [
+            dict(library, enabled=config.enabled_libraries.get(library["id"], True))
+            for library in libraries
+        ]
         return jsonify({"libraries": libraries})
 
     except Exception as e:
@@ -563,65 +585,30 @@ def list_libraries():
 @admin_bp.route("/update_libraries", methods=["POST"])
 def update_libraries():
     """Update library configuration and trigger a scan."""
-    config = load_config()
+    config = _get_config()
 
     # Get the enabled library IDs from the form
-    enabled_libraries = request.form.getlist("enabled_libraries[]")
+    enabled_libraries = set(request.form.getlist("enabled_libraries[]"))
 
-    # Get all libraries to set the proper state for each
-    all_libraries = []
-
-    if config.jellyfin_url and config.jellyfin_api_key:
-        # Get Jellyfin libraries
-        headers = {
-            "X-MediaBrowser-Token": config.jellyfin_api_key,
-            "Content-Type": "application/json",
-        }
-        response = requests.get(
-            f"{config.jellyfin_url}/Library/VirtualFolders", headers=headers
-        )
-
-        if response.status_code == 200:
-            sections = response.json()
-
-            for section in sections:
-                section_id = section.get("ItemId")
-                if section_id:
-                    all_libraries.append(section_id)
-
-    elif config.plex_url and config.plex_token:
-        # Get Plex libraries
-        headers = {
-            "X-Plex-Token": config.plex_token,
-            "Accept": "application/json",
-        }
-        response = requests.get(f"{config.plex_url}/library/sections", headers=headers)
-
-        if response.status_code == 200:
-            data = response.json()
-            sections = data.get("MediaContainer", {}).get("Directory", [])
-
-            for section in sections:
-                section_id = section.get("key")
-                if section_id:
-                    all_libraries.append(section_id)
+    # All library IDs are rendered into the form next to the toggles; fall back
+    # to the (cached) server listing for forms that don't include them
+    all_libraries = request.form.getlist("all_library_ids[]")
+    if not all_libraries:
+        all_libraries = [library["id"] for library in _get_libraries(config)]
 
     # Update enabled_libraries in config
-    new_enabled_libraries = {}
-    for library_id in all_libraries:
-        new_enabled_libraries[library_id] = library_id in enabled_libraries
+    new_enabled_libraries = {
+        library_id: library_id in enabled_libraries for library_id in all_libraries
+    }
 
     config.enabled_libraries = new_enabled_libraries
 
     # Save the config
-    save_config(config)
-
-    # Clear existing media and trigger a new scan
-    from squishy.scanner import MEDIA, TV_SHOWS, scan_jellyfin_async, scan_plex_async
+    save_config_async(config)
+    _clear_libraries_cache()
 
-    # Clear existing media items
-    MEDIA.clear()
-    TV_SHOWS.clear()
+    # Clear existing media items before triggering a new scan
+    clear_media()
 
     # Start a new scan in background
     if config.jellyfin_url and config.jellyfin_api_key:
@@ -639,7 +626,7 @@ def update_libraries():
 @admin_bp.route("/update_path_mappings", methods=["POST"])
 def update_path_mappings():
     """Update path mapping configuration."""
-    config = load_config()
+    config = _get_config()
 
     # Get source and target paths from form
     source_path = request.form.get("source_path", "").strip()
@@ -653,7 +640,7 @@ def update_path_mappings():
     # Update config
     config.path_mappings = path_mappings
 
-    save_config(config)
+    save_config_async(config)
     flash("Path mapping updated")
     return redirect(url_for("admin.index"))
 
@@ -661,25 +648,23 @@ def update_path_mappings():
 @admin_bp.route("/update_log_level", methods=["POST"])
 def update_log_level():
     """Update application log level."""
-    config = load_config()
+    config = _get_config()
 
     # Get the new log level
     log_level = request.form["log_level"].upper()
 
     # Validate log level
-    valid_levels = ["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"]
-    if log_level not in valid_levels:
+    level = _LOG_LEVELS.get(log_level)
+    if level is None:
         flash(f"Invalid log level: {log_level}. Using INFO instead.")
-        log_level = "INFO"
+        log_level, level = "INFO", logging.INFO
 
     # Update config
     config.log_level = log_level
-    save_config(config)
+    save_config_async(config)
 
     # Update the current application's log level
-    import logging
-
-    logging.getLogger().setLevel(getattr(logging, log_level))
+    logging.getLogger().setLevel(level)
 
     flash(f"Log level updated to {log_level}")
     return redirect(url_for("admin.index"))
@@ -688,7 +673,7 @@ def update_log_level():
 @admin_bp.route("/update_paths_and_hw", methods=["POST"])
 def update_paths_and_hw():
     """Update path configuration."""
-    config = load_config()
+    config = _get_config()
 
     # Get media and transcode paths
     media_path = request.form["media_path"].strip()
@@ -707,24 +692,20 @@ def update_paths_and_hw():
     # Get path mappings
     path_mappings = {}
 
-    # Process all source_path_X and target_path_X pairs
-    # We'll look for all source_path_0, source_path_1, etc.
-    i = 0
-    while True:
-        source_key = f"source_path_{i}"
-        target_key = f"target_path_{i}"
+    # Process all source_path_X and target_path_X pairs in one pass over
+    # the submitted keys, so gaps in the numbering don't end the scan
+    form = request.form
+    for source_key in form:
+        if not source_key.startswith("source_path_"):
+            continue
 
-        if source_key not in request.form or target_key not in request.form:
-            break
-
-        source = request.form.get(source_key, "").strip()
-        target = request.form.get(target_key, "").strip()
+        index = source_key[len("source_path_"):]
+        source = form[source_key].strip()
+        target = form.get(f"target_path_{index}", "").strip()
 
         if source and target:
             path_mappings[source] = target
 
-        i += 1
-
     # Check if the concurrent job limit changed
     old_max_concurrent_jobs = config.max_concurrent_jobs
     new_max_concurrent_jobs = max_concurrent_jobs
@@ -743,8 +724,8 @@ def update_paths_and_hw():
     else:
         current_app.logger.debug("No path mappings configured")
 
-    # Save config first so process_job_queue uses the updated max_concurrent_jobs
-    save_config(config)
+    # Queue the save first; load_config() in process_job_queue already sees it
+    save_config_async(config)
 
     # Check job queue if concurrent jobs limit changed
     if new_max_concurrent_jobs != old_max_concurrent_jobs:
@@ -785,14 +766,56 @@ def update_paths_and_hw():
     return redirect(url_for("admin.index"))
 
 
+# Capability detection results keyed by (ffmpeg_path, ffmpeg_mtime)
+_CAPS_CACHE = {}
+_CAPS_CACHE_LOCK = threading.Lock()
+_CAPS_CACHE_ENTRIES = 4
+
+
+def _detect_caps(ffmpeg_path, ffmpeg_mtime, force=False):
+    """Run effeffmpeg capability detection, memoized per ffmpeg binary version.
+
+    A forced run always probes again and replaces the memoized result for
+    that binary, leaving entries for other binaries alone.
+    """
+    key = (ffmpeg_path, ffmpeg_mtime)
+    if not force:
+        with _CAPS_CACHE_LOCK:
+            if key in _CAPS_CACHE:
+                return _CAPS_CACHE[key]
+
+    capabilities = detect_capabilities(ffmpeg_path, quiet=True, force_refresh=force)
+
+    with _CAPS_CACHE_LOCK:
+        _CAPS_CACHE.pop(key, None)
+        if len(_CAPS_CACHE) >= _CAPS_CACHE_ENTRIES:
+            # Drop the oldest entry
+            del _CAPS_CACHE[next(iter(_CAPS_CACHE))]
+        _CAPS_CACHE[key] = capabilities
+    return capabilities
+
+
+def _ffmpeg_mtime(ffmpeg_path):
+    """Return the mtime of the ffmpeg binary (resolved via PATH), or None."""
+    resolved = shutil.which(ffmpeg_path) or ffmpeg_path
+    try:
+        return os.stat(resolved).st_mtime_ns
+    except OSError:
+        return None
+
+
 @admin_bp.route("/detect_hw_accel")
 def detect_hw_accel_route():
     """Detect available hardware acceleration methods and return as JSON."""
-    config = load_config()
+    config = _get_config()
     ffmpeg_path = config.ffmpeg_path
 
-    # Run detection
-    hw_accel_info = detect_hw_accel(ffmpeg_path)
+    # Probing shells out to ffmpeg, so reuse the memoized result unless a
+    # refresh is requested; everything below is derived from this one probe
+    detected_capabilities = _detect_caps(
+        ffmpeg_path, _ffmpeg_mtime(ffmpeg_path), force=bool(request.args.get("force"))
+    )
+    hw_accel_info = detect_hw_accel(ffmpeg_path, capabilities=detected_capabilities)
 
     # Automatically set the recommended hardware acceleration method
     if hw_accel_info["recommended"]["method"]:
@@ -802,9 +825,6 @@ def detect_hw_accel_route():
         hw_accel_info["auto_configured"] = True
 
     # Include the raw capabilities JSON from effeffmpeg detection
-    from squishy.effeffmpeg import detect_capabilities
-
-    detected_capabilities = detect_capabilities(quiet=True)
     hw_accel_info["capabilities_json"] = detected_capabilities
 
     # If we already have capabilities saved in config, include them as well
@@ -814,55 +834,47 @@ def detect_hw_accel_route():
     return jsonify(hw_accel_info)
 
 
+# Keys a capabilities document must have, with the type each value must be (if any)
+_REQUIRED_CAPABILITY_KEYS = (
+    ("hwaccel", None),
+    ("device", None),
+    ("encoders", dict),
+    ("fallback_encoders", dict),
+)
+
+
+def _validate_capabilities(capabilities):
+    """Return an error message for an invalid capabilities document, else None."""
+    if not isinstance(capabilities, dict):
+        return "Capabilities data must be a dictionary"
+
+    for key, expected_type in _REQUIRED_CAPABILITY_KEYS:
+        if key not in capabilities:
+            return f"Missing required key: {key}"
+        if expected_type is not None and not isinstance(capabilities[key], expected_type):
+            return f"{key} must be a dictionary"
+
+    return None
+
+
 @admin_bp.route("/save_hw_capabilities", methods=["POST"])
 def save_hw_capabilities():
     """Save custom hardware capabilities JSON to the config."""
     try:
         # Get the capabilities JSON from the request
-        capabilities_json = request.json.get("capabilities")
+        capabilities_json = (request.get_json(silent=True) or {}).get("capabilities")
         if not capabilities_json:
             return jsonify(
                 {"success": False, "error": "No capabilities data provided"}
             ), 400
 
         # Validate the capabilities JSON structure
-        try:
-            if not isinstance(capabilities_json, dict):
-                return jsonify(
-                    {
-                        "success": False,
-                        "error": "Capabilities data must be a dictionary",
-                    }
-                ), 400
-
-            required_keys = ["hwaccel", "device", "encoders", "fallback_encoders"]
-            for key in required_keys:
-                if key not in capabilities_json:
-                    return jsonify(
-                        {"success": False, "error": f"Missing required key: {key}"}
-                    ), 400
-
-            # Validate encoders and fallback_encoders are dictionaries
-            if not isinstance(capabilities_json["encoders"], dict):
-                return jsonify(
-                    {"success": False, "error": "encoders must be a dictionary"}
-                ), 400
-
-            if not isinstance(capabilities_json["fallback_encoders"], dict):
-                return jsonify(
-                    {
-                        "success": False,
-                        "error": "fallback_encoders must be a dictionary",
-                    }
-                ), 400
-
-        except Exception as e:
-            return jsonify(
-                {"success": False, "error": f"Validation error: {str(e)}"}
-            ), 400
+        error = _validate_capabilities(capabilities_json)
+        if error:
+            return jsonify({"success": False, "error": error}), 400
 
         # Update config with the hardware capabilities
-        config = load_config()
+        config = _get_config()
         config.hw_capabilities = capabilities_json
 
         # Extract hardware acceleration method and device from capabilities
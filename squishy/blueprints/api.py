@@ -1,92 +1,189 @@
 """API blueprint for Squishy."""
 
-import traceback
-
-from flask import Blueprint, jsonify, request
-
-from squishy.config import load_config
-from squishy.scanner import get_all_media, get_media, get_scan_status
-from squishy.transcoder import create_job, get_job, start_transcode
+import functools
+import hashlib
+import logging
+import os
+import threading
+import time
+import uuid
+
+import orjson
+from flask import Blueprint, Response, current_app, jsonify, make_response, request
+
+from squishy.config import get_config_version, load_config
+from squishy.scanner import (
+    get_all_media,
+    get_media,
+    get_media_counts,
+    get_scan_status,
+    get_scan_version,
+    get_shows_and_movies_page,
+)
+from squishy.transcoder import (
+    JOBS,
+    JOBS_LOCK,
+    cancel_job,
+    create_job,
+    get_job,
+    get_jobs_version,
+    remove_job,
+    start_transcode,
+    wait_for_jobs_change,
+)
 from squishy.media_info import get_media_info, format_file_size
 
+logger = logging.getLogger(__name__)
+
 api_bp = Blueprint("api", __name__)
 
+# Version counters restart with the process, so tags carry a per-process prefix
+_ETAG_PREFIX = uuid.uuid4().hex[:8]
+
+
+def conditional_etag(make_tag):
+    """
+    Serve a view with a weak ETag and answer matching requests with 304.
+
+    ``make_tag`` returns a string that changes whenever the view's output
+    would, so unchanged responses are neither rebuilt nor re-sent.
+    """
+
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            etag = f"{_ETAG_PREFIX}-{make_tag()}"
+            if request.if_none_match.contains_weak(etag):
+                response = make_response("", 304)
+            else:
+                response = make_response(view(*args, **kwargs))
+            response.set_etag(etag, weak=True)
+            return response
+
+        return wrapper
+
+    return decorator
+
+
+# Records encoded per chunk when streaming a JSON list
+_STREAM_BATCH_SIZE = 500
+
+
+def _stream_json_list(key, items, to_dict):
+    """
+    Stream ``{key: [...]}`` with each item converted by ``to_dict``.
+
+    Records are encoded in batches, so the full list is never built as
+    Python dicts or as one JSON string.
+    """
+
+    def generate():
+        yield b'{"' + key.encode() + b'":['
+        for start in range(0, len(items), _STREAM_BATCH_SIZE):
+            batch = items[start : start + _STREAM_BATCH_SIZE]
+            chunk = b",".join(orjson.dumps(to_dict(item)) for item in batch)
+            yield chunk if start == 0 else b"," + chunk
+        yield b"]}\n"
+
+    return Response(generate(), mimetype="application/json")
+
+
+def _media_tag():
+    """ETag source for views that depend on the media collection and query."""
+    query = hashlib.blake2b(request.query_string, digest_size=8).hexdigest()
+    return f"{get_scan_version()}-{query}"
+
+
+def _config_tag():
+    """ETag source for views that depend only on the configuration."""
+    generation, mtime = get_config_version()
+    return f"{generation}-{mtime}"
+
 
 @api_bp.route("/media", methods=["GET"])
+@conditional_etag(_media_tag)
 def list_media():
     """List all media items."""
     media_items = get_all_media()
-    return jsonify(
-        {
-            "media": [
-                {
-                    "id": item.id,
-                    "title": item.title,
-                    "year": item.year,
-                    "type": item.type,
-                    "poster_url": item.poster_url,
-                }
-                for item in media_items
-            ]
-        }
+    return _stream_json_list(
+        "media",
+        media_items,
+        lambda item: {
+            "id": item.id,
+            "title": item.title,
+            "year": item.year,
+            "type": item.type,
+            "poster_url": item.poster_url,
+        },
     )
 
 
 @api_bp.route("/paginated-media", methods=["GET"])
+@conditional_etag(_media_tag)
 def paginated_media():
-    """Get paginated shows and movies data."""
-    from squishy.scanner import get_shows_and_movies
-
+    """
+    Get paginated shows and movies data.
+
+    Query parameters:
+        q: Case-insensitive title search
+        page: 1-based page number; all matches are returned when omitted
+        per_page: Items per page for each list (default 12, max 100)
+        type: "shows" or "movies" to return only that list
+    """
     # Get search query
     search_query = request.args.get("q", "").strip().lower()
 
-    # Get all shows and movies
-    all_shows, all_movies = get_shows_and_movies()
-
-    # Sort alphabetically by title
-    all_shows = sorted(all_shows, key=lambda x: x.title.lower())
-    all_movies = sorted(all_movies, key=lambda x: x.title.lower())
+    # Get pagination window
+    page = request.args.get("page", type=int)
+    per_page = None
+    offset = 0
+    if page is not None:
+        page = max(page, 1)
+        per_page = min(max(request.args.get("per_page", 12, type=int), 1), 100)
+        offset = (page - 1) * per_page
+
+    # Get the requested slice of the sorted, filtered shows and movies
+    page_shows, total_shows, page_movies, total_movies = get_shows_and_movies_page(
+        search_query, offset, per_page
+    )
 
-    # Filter by search query if provided
-    if search_query:
-        all_shows = [show for show in all_shows if search_query in show.title.lower()]
-        all_movies = [
-            movie for movie in all_movies if search_query in movie.title.lower()
-        ]
+    media_type = request.args.get("type")
+    result = {}
 
     # Convert shows to simplified format
-    shows_data = [
-        {
-            "id": show.id,
-            "title": show.title,
-            "display_name": show.display_name,
-            "year": show.year,
-            "poster_url": show.poster_url,
-            "season_count": len(show.seasons),
-        }
-        for show in all_shows
-    ]
+    if media_type != "movies":
+        result["shows"] = [
+            {
+                "id": show.id,
+                "title": show.title,
+                "display_name": show.display_name,
+                "year": show.year,
+                "poster_url": show.poster_url,
+                "season_count": len(show.seasons),
+            }
+            for show in page_shows
+        ]
+        result["total_shows"] = total_shows
 
     # Convert movies to simplified format
-    movies_data = [
-        {
-            "id": movie.id,
-            "title": movie.title,
-            "display_name": movie.display_name,
-            "year": movie.year,
-            "poster_url": movie.poster_url,
-        }
-        for movie in all_movies
-    ]
+    if media_type != "shows":
+        result["movies"] = [
+            {
+                "id": movie.id,
+                "title": movie.title,
+                "display_name": movie.display_name,
+                "year": movie.year,
+                "poster_url": movie.poster_url,
+            }
+            for movie in page_movies
+        ]
+        result["total_movies"] = total_movies
 
-    return jsonify(
-        {
-            "shows": shows_data,
-            "total_shows": len(shows_data),
-            "movies": movies_data,
-            "total_movies": len(movies_data),
-        }
-    )
+    if page is not None:
+        result["page"] = page
+        result["per_page"] = per_page
+
+    return jsonify(result)
 
 
 @api_bp.route("/media/<media_id>", methods=["GET"])
@@ -108,30 +205,44 @@ def get_media_item(media_id):
     )
 
 
+# Encoded /presets response as (config version, body)
+_PRESETS_PAYLOAD = None
+
+
 @api_bp.route("/presets", methods=["GET"])
+@conditional_etag(_config_tag)
 def list_presets():
     """List all transcoding presets."""
-    config = load_config()
+    global _PRESETS_PAYLOAD
+
+    # Presets only change when the config is saved, so encode them once per
+    # config version
+    version = get_config_version()
+    cached = _PRESETS_PAYLOAD
+    if cached is None or cached[0] != version:
+        config = load_config()
+        body = orjson.dumps(
+            {
+                "presets": [
+                    {
+                        "name": name,
+                        "codec": preset.get("codec", "h264"),
+                        "scale": preset.get("scale", "1080p"),
+                        "container": preset.get("container", ".mkv"),
+                        "crf": preset.get("crf"),
+                        "bitrate": preset.get("bitrate"),
+                        "audio_codec": preset.get("audio_codec", "aac"),
+                        "audio_bitrate": preset.get("audio_bitrate", "128k"),
+                        "force_software": preset.get("force_software", False),
+                        "allow_fallback": preset.get("allow_fallback", True),
+                    }
+                    for name, preset in config.presets.items()
+                ]
+            }
+        )
+        _PRESETS_PAYLOAD = cached = (version, body)
 
-    return jsonify(
-        {
-            "presets": [
-                {
-                    "name": name,
-                    "codec": preset.get("codec", "h264"),
-                    "scale": preset.get("scale", "1080p"),
-                    "container": preset.get("container", ".mkv"),
-                    "crf": preset.get("crf"),
-                    "bitrate": preset.get("bitrate"),
-                    "audio_codec": preset.get("audio_codec", "aac"),
-                    "audio_bitrate": preset.get("audio_bitrate", "128k"),
-                    "force_software": preset.get("force_software", False),
-                    "allow_fallback": preset.get("allow_fallback", True),
-                }
-                for name, preset in config.presets.items()
-            ]
-        }
-    )
+    return current_app.response_class(cached[1], mimetype="application/json")
 
 
 @api_bp.route("/transcode", methods=["POST"])
@@ -173,33 +284,82 @@ def transcode():
     )
 
 
+def _encode_job(job) -> bytes:
+    """Encode the API representation of a job as JSON bytes."""
+    return orjson.dumps(
+        {
+            "id": job.id,
+            "media_id": job.media_id,
+            "preset": job.preset_name,
+            "status": job.status,
+            "progress": job.progress,
+            "output_path": job.output_path,
+            "error_message": job.error_message,
+            "current_time": job.current_time,
+            "duration": job.duration,
+            "ffmpeg_logs": job.tail_logs(30),  # Include last 30 log lines
+        }
+    )
+
+
+# Encoded /jobs response as (jobs version, body)
+_JOBS_PAYLOAD = None
+_JOBS_PAYLOAD_LOCK = threading.Lock()
+
+# Seconds between keep-alive comments on an idle job stream, and the minimum
+# gap between events so bursts of progress updates are coalesced
+_JOBS_STREAM_KEEPALIVE = 15
+_JOBS_STREAM_MIN_INTERVAL = 0.5
+
+
+def _get_jobs_body() -> bytes:
+    """Get the encoded job listing, rebuilding it only after a job changes."""
+    global _JOBS_PAYLOAD
+
+    # Read the version first so a concurrent change rebuilds next time
+    version = get_jobs_version()
+    cached = _JOBS_PAYLOAD
+    if cached is None or cached[0] != version:
+        with JOBS_LOCK:
+            jobs = list(JOBS.values())
+
+        body = b'{"jobs":[' + b",".join(map(_encode_job, jobs)) + b"]}"
+        with _JOBS_PAYLOAD_LOCK:
+            _JOBS_PAYLOAD = cached = (version, body)
+
+    return cached[1]
+
+
 @api_bp.route("/jobs", methods=["GET"])
 def list_jobs():
     """List all transcoding jobs."""
-    from squishy.transcoder import JOBS
+    # Dashboards poll this endpoint, so the encoded body is reused until a
+    # job changes
+    return current_app.response_class(_get_jobs_body(), mimetype="application/json")
 
-    return jsonify(
-        {
-            "jobs": [
-                {
-                    "id": job.id,
-                    "media_id": job.media_id,
-                    "preset": job.preset_name,
-                    "status": job.status,
-                    "progress": job.progress,
-                    "output_path": job.output_path,
-                    "error_message": job.error_message,
-                    "current_time": job.current_time
-                    if hasattr(job, "current_time")
-                    else None,
-                    "duration": job.duration if hasattr(job, "duration") else None,
-                    "ffmpeg_logs": job.ffmpeg_logs[-30:]
-                    if job.ffmpeg_logs
-                    else [],  # Include last 30 log lines
-                }
-                for job in JOBS.values()
-            ]
-        }
+
+@api_bp.route("/jobs/stream", methods=["GET"])
+def stream_jobs():
+    """Stream the job listing as Server-Sent Events whenever a job changes."""
+
+    def generate():
+        version = get_jobs_version()
+        yield b"data: " + _get_jobs_body() + b"\n\n"
+
+        while True:
+            current = wait_for_jobs_change(version, _JOBS_STREAM_KEEPALIVE)
+            if current == version:
+                yield b": keep-alive\n\n"
+                continue
+
+            version = current
+            yield b"data: " + _get_jobs_body() + b"\n\n"
+            time.sleep(_JOBS_STREAM_MIN_INTERVAL)
+
+    return Response(
+        generate(),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
 
 
@@ -210,29 +370,12 @@ def get_job_status(job_id):
     if job is None:
         return jsonify({"error": "Job not found"}), 404
 
-    return jsonify(
-        {
-            "id": job.id,
-            "media_id": job.media_id,
-            "preset": job.preset_name,
-            "status": job.status,
-            "progress": job.progress,
-            "output_path": job.output_path,
-            "error_message": job.error_message,
-            "current_time": job.current_time if hasattr(job, "current_time") else None,
-            "duration": job.duration if hasattr(job, "duration") else None,
-            "ffmpeg_logs": job.ffmpeg_logs[-30:]
-            if job.ffmpeg_logs
-            else [],  # Include last 30 log lines
-        }
-    )
+    return current_app.response_class(_encode_job(job), mimetype="application/json")
 
 
 @api_bp.route("/jobs/<job_id>/cancel", methods=["POST"])
 def cancel_job_api(job_id):
     """Cancel a transcoding job."""
-    from squishy.transcoder import cancel_job
-
     success = cancel_job(job_id)
     if success:
         return jsonify({"status": "cancelled"})
@@ -243,8 +386,6 @@ def cancel_job_api(job_id):
 @api_bp.route("/jobs/<job_id>/remove", methods=["POST"])
 def remove_job_api(job_id):
     """Remove a completed, failed, or cancelled job."""
-    from squishy.transcoder import remove_job
-
     success = remove_job(job_id)
     if success:
         return jsonify({"status": "removed"})
@@ -264,10 +405,10 @@ def get_job_logs(job_id):
 
     if limit and limit.isdigit() and int(limit) > 0:
         # Get the last N log entries
-        log_entries = job.ffmpeg_logs[-int(limit) :]
+        log_entries = job.tail_logs(int(limit))
     else:
         # Get all log entries
-        log_entries = job.ffmpeg_logs
+        log_entries = list(job.ffmpeg_logs)
 
     return jsonify({"ffmpeg_command": job.ffmpeg_command, "ffmpeg_logs": log_entries})
 
@@ -280,78 +421,102 @@ def scan_status():
     return jsonify(status)
 
 
-@api_bp.route("/media/<media_id>/technical_info", methods=["GET"])
-def get_media_technical_info(media_id):
-    """Get detailed technical information about a specific media item."""
-    # Improved debug logging
-    print(f"DEBUG: Received technical info request for media ID: {media_id}")
+class _ProbeFailed(Exception):
+    """Raised so failed probes are not memoized by _probe_cached."""
 
-    media_item = get_media(media_id)
-    if media_item is None:
-        print(f"DEBUG: Media item not found for ID: {media_id}")
-        return jsonify({"error": "Media not found"}), 404
+    def __init__(self, media_info):
+        super().__init__(media_info["error"])
+        self.media_info = media_info
 
-    try:
-        print(f"DEBUG: Processing technical info for path: {media_item.path}")
 
-        # Check if the file exists
-        import os
+@functools.lru_cache(maxsize=4096)
+def _probe_cached(path, mtime_ns, size):
+    """
+    Probe a media file and build its technical info response.
 
-        if not os.path.exists(media_item.path):
-            print(f"DEBUG: File does not exist: {media_item.path}")
-            return jsonify({"error": f"Media file not found at {media_item.path}"}), 404
+    Keyed by the file's mtime and size, so a replaced file is probed again.
+    The returned dict is shared between requests and must not be modified.
+    """
+    # Get technical information about the media file
+    media_info = get_media_info(path)
 
-        # Get technical information about the media file
-        media_info = get_media_info(media_item.path)
+    # Check if there was an error in get_media_info
+    if "error" in media_info:
+        raise _ProbeFailed(media_info)
 
-        # Check if there was an error in get_media_info
-        if "error" in media_info:
-            print(f"DEBUG: Error in get_media_info: {media_info['error']}")
-            return jsonify(media_info), 500
+    # Format file size for display
+    file_size = format_file_size(media_info.get("format", {}).get("size", 0))
 
-        # Format file size for display
-        file_size = format_file_size(media_info.get("format", {}).get("size", 0))
+    # Add the formatted file size to the response
+    media_info["formatted_file_size"] = file_size
 
-        # Add the formatted file size to the response
-        media_info["formatted_file_size"] = file_size
+    # Add minimal info for resolution and HDR badges
+    basic_info = {
+        "has_resolution_badge": False,
+        "resolution_badge": "",
+        "has_hdr": False,
+        "hdr_type": "",
+    }
 
-        # Add minimal info for resolution and HDR badges
-        basic_info = {
-            "has_resolution_badge": False,
-            "resolution_badge": "",
-            "has_hdr": False,
-            "hdr_type": "",
-        }
+    # Check for resolution badges
+    if media_info.get("video") and len(media_info["video"]) > 0:
+        video = media_info["video"][0]
+        width = video.get("width", 0)
+
+        if width >= 3840:
+            basic_info["has_resolution_badge"] = True
+            basic_info["resolution_badge"] = "4K"
+        elif width >= 1920:
+            basic_info["has_resolution_badge"] = True
+            basic_info["resolution_badge"] = "HD"
+
+    # Check for HDR
+    if media_info.get("hdr_info"):
+        basic_info["has_hdr"] = True
+        basic_info["hdr_type"] = media_info["hdr_info"].get("type", "")
 
-        # Check for resolution badges
-        if media_info.get("video") and len(media_info["video"]) > 0:
-            video = media_info["video"][0]
-            width = video.get("width", 0)
+    media_info["basic_info"] = basic_info
+    return media_info
 
-            if width >= 3840:
-                basic_info["has_resolution_badge"] = True
-                basic_info["resolution_badge"] = "4K"
-            elif width >= 1920:
-                basic_info["has_resolution_badge"] = True
-                basic_info["resolution_badge"] = "HD"
 
-        # Check for HDR
-        if media_info.get("hdr_info"):
-            basic_info["has_hdr"] = True
-            basic_info["hdr_type"] = media_info["hdr_info"].get("type", "")
+@api_bp.route("/media/<media_id>/technical_info", methods=["GET"])
+def get_media_technical_info(media_id):
+    """Get detailed technical information about a specific media item."""
+    media_item = get_media(media_id)
+    if media_item is None:
+        logger.debug("Media item not found for ID: %s", media_id)
+        return jsonify({"error": "Media not found"}), 404
 
-        media_info["basic_info"] = basic_info
+    try:
+        logger.debug("Processing technical info for %s: %s", media_id, media_item.path)
 
-        # Log successful processing
-        print(f"DEBUG: Successfully processed technical info for media ID: {media_id}")
+        # Check if the file exists; the stat also keys the probe cache
+        try:
+            st = os.stat(media_item.path)
+        except FileNotFoundError:
+            logger.debug("File does not exist: %s", media_item.path)
+            return jsonify({"error": f"Media file not found at {media_item.path}"}), 404
 
-        return jsonify(media_info)
+        # Media files rarely change, so let the browser revalidate cheaply
+        etag = f"{st.st_mtime_ns:x}-{st.st_size:x}"
+        if request.if_none_match.contains_weak(etag):
+            response = make_response("", 304)
+        else:
+            try:
+                media_info = _probe_cached(media_item.path, st.st_mtime_ns, st.st_size)
+            except _ProbeFailed as e:
+                logger.debug("Error in get_media_info: %s", e)
+                return jsonify(e.media_info), 500
+            response = jsonify(media_info)
+
+        response.set_etag(etag, weak=True)
+        response.headers["Cache-Control"] = (
+            "public, max-age=3600, stale-while-revalidate=600"
+        )
+        return response
     except Exception as e:
-        # Enhanced error logging
-        print(f"DEBUG: Error processing technical info for media ID: {media_id}")
-        print(f"DEBUG: Error type: {type(e).__name__}")
-        print(f"DEBUG: Error message: {str(e)}")
-        print(f"DEBUG: Traceback: {traceback.format_exc()}")
+        # The traceback is only formatted if the record is actually emitted
+        logger.exception("Error processing technical info for media ID: %s", media_id)
 
         return jsonify({"error": f"Error getting technical info: {str(e)}"}), 500
 
@@ -359,33 +524,14 @@ def get_media_technical_info(media_id):
 @api_bp.route("/stats", methods=["GET"])
 def get_media_stats():
     """Get statistics about media in the library."""
-    from squishy.scanner import MEDIA, TV_SHOWS, MEDIA_LOCK, TV_SHOWS_LOCK
-
-    # Use locks to safely access the dictionaries
-    with MEDIA_LOCK, TV_SHOWS_LOCK:
-        # Count movies and episodes
-        movies = [item for item in MEDIA.values() if item.type == "movie"]
-        episodes = [item for item in MEDIA.values() if item.type == "episode"]
-
-        # Get unique shows
-        shows = list(TV_SHOWS.values())
-
-        return jsonify(
-            {
-                "success": True,
-                "movies": len(movies),
-                "shows": len(shows),
-                "episodes": len(episodes),
-                "total_items": len(MEDIA),
-            }
-        )
+    # Counts are copied out under the scanner locks; the response is built
+    # after they are released
+    return jsonify({"success": True, **get_media_counts()})
 
 
 @api_bp.route("/files", methods=["GET"])
 def list_files():
     """List files and directories for file browser."""
-    import os
-
     # Get path from query parameter
     path = request.args.get("path", "/")
 
@@ -394,28 +540,30 @@ def list_files():
         path = "/"
 
     try:
-        # Get directories and files in the path
-        entries = os.listdir(path)
-
         # Split into directories and files
         directories = []
         files = []
 
-        for entry in sorted(entries):
-            full_path = os.path.join(path, entry)
-
-            # Skip hidden files
-            if entry.startswith("."):
-                continue
-
-            try:
-                if os.path.isdir(full_path):
-                    directories.append(entry)
-                else:
-                    files.append(entry)
-            except (PermissionError, OSError):
-                # Skip entries we don't have permission to access
-                continue
+        # DirEntry types come from the directory listing, so only symlinks
+        # need an extra stat
+        with os.scandir(path) as entries:
+            for entry in entries:
+                # Skip hidden files
+                if entry.name.startswith("."):
+                    continue
+
+                try:
+                    if entry.is_dir():
+                        directories.append(entry.name)
+                    else:
+                        files.append(entry.name)
+                except (PermissionError, OSError):
+                    # Skip entries we don't have permission to access
+                    continue
+
+        # Sort entries alphabetically
+        directories.sort()
+        files.sort()
 
         return jsonify(
             {"success": True, "path": path, "directories": directories, "files": files}
@@ -1,6 +1,9 @@
 """User interface blueprint."""
 
+import logging
 import os
+import stat
+from functools import lru_cache
 from flask import (
     Blueprint,
     render_template,
@@ -9,12 +12,14 @@ from flask import (
     url_for,
     flash,
     send_file,
+    session,
 )
 
-from squishy.config import load_config
-from squishy.scanner import get_media, get_show
+from squishy.config import get_config_version, load_config
+from squishy.scanner import get_media, get_media_ids, get_scan_version, get_show
 from squishy.transcoder import (
     JOBS,
+    JOBS_LOCK,
     create_job,
     start_transcode,
     apply_output_path_mapping,
@@ -25,6 +30,8 @@ from squishy.completed import get_completed_transcodes, delete_transcode
 
 ui_bp = Blueprint("ui", __name__)
 
+logger = logging.getLogger(__name__)
+
 
 # Helper function to format file size
 def format_file_size(bytes_size):
@@ -36,6 +43,26 @@ def format_file_size(bytes_size):
         return f"{round(bytes_size / (1024 * 1024 * 1024), 2)} GB"
 
 
+@lru_cache(maxsize=8)
+def _transcode_roots(transcode_path, config_version):
+    """
+    Resolve the mapped and real transcode directory for a config version.
+
+    The config version is part of the key so a saved path mapping change
+    is picked up on the next request.
+    """
+    mapped_path = os.path.normpath(apply_output_path_mapping(transcode_path))
+    return mapped_path, os.path.realpath(mapped_path)
+
+
+def _stat_or_none(path):
+    """Stat a path, returning None if it doesn't exist or can't be accessed."""
+    try:
+        return os.stat(path)
+    except OSError:
+        return None
+
+
 @ui_bp.route("/")
 def index():
     """Display the home page with client-side pagination and search."""
@@ -70,34 +97,55 @@ def media_detail(media_id):
 @ui_bp.route("/shows/<show_id>")
 def show_detail(show_id):
     """Display details for a TV show."""
-    show = get_show(show_id)
-    if show is None:
+    # The page only changes with the media collection or the presets, so
+    # reuse the rendered HTML unless flashed messages need to be shown
+    if "_flashes" in session:
+        html = _render_show_detail(show_id)
+    else:
+        html = _cached_show_detail(show_id, get_scan_version(), get_config_version())
+
+    if html is None:
         flash("Show not found")
         return redirect(url_for("ui.index"))
+    return html
+
+
+@lru_cache(maxsize=32)
+def _cached_show_detail(show_id, scan_version, config_version):
+    """Render a show page once per media collection and config version."""
+    return _render_show_detail(show_id)
+
+
+def _render_show_detail(show_id):
+    """Render the show detail page, or return None if the show is unknown."""
+    show = get_show(show_id)
+    if show is None:
+        return None
 
     config = load_config()
 
-    # Count episodes for display and collect episode IDs for validation
-    episode_count = 0
-    episode_ids = []
-    valid_episode_ids = set()
-
-    for season in show.seasons.values():
-        for episode in season.episodes.values():
-            episode_count += 1
-            # Verify each episode exists in MEDIA dictionary
-            media_item = get_media(episode.id)
-            if not media_item:
-                print(
-                    f"WARNING: Episode {episode.id} from show {show_id} not found in MEDIA dictionary"
-                )
-            else:
-                episode_ids.append(episode.id)
-                valid_episode_ids.add(episode.id)
+    # Collect episode IDs and validate them against MEDIA in one set operation
+    show_episode_ids = {
+        episode.id
+        for season in show.seasons.values()
+        for episode in season.episodes.values()
+    }
+    valid_episode_ids = show_episode_ids & get_media_ids()
+    episode_count = len(show_episode_ids)
+
+    for episode_id in show_episode_ids - valid_episode_ids:
+        logger.warning(
+            "Episode %s from show %s not found in MEDIA dictionary",
+            episode_id,
+            show_id,
+        )
 
     # Log total episode count
-    print(
-        f"Show {show_id} has {episode_count} episodes, {len(episode_ids)} valid in MEDIA dictionary"
+    logger.debug(
+        "Show %s has %d episodes, %d valid in MEDIA dictionary",
+        show_id,
+        episode_count,
+        len(valid_episode_ids),
     )
 
     return render_template(
@@ -139,30 +187,54 @@ def transcode(media_id):
         return redirect(url_for("ui.show_detail", show_id=media_item.show_id))
 
 
+# Job list each status is shown under on the jobs page; failed and cancelled
+# jobs share the failed list
+_JOB_GROUPS = {
+    "processing": "processing",
+    "pending": "pending",
+    "completed": "completed",
+}
+
+
 @ui_bp.route("/jobs")
 def jobs():
     """Display transcoding jobs grouped by status."""
 
-    # Get media items for each job to display title instead of ID
-    active_jobs = []
-    completed_jobs = []
-    failed_jobs = []
+    # Partition jobs in a single pass; processing jobs are listed ahead of
+    # pending ones in the active list
+    groups = {"processing": [], "pending": [], "completed": [], "failed": []}
 
-    for job in JOBS.values():
+    with JOBS_LOCK:
+        all_jobs = list(JOBS.values())
+
+    for job in all_jobs:
+        # Get media items for each job to display title instead of ID
         media_item = get_media(job.media_id)
+        media_title = "Unknown"
+        file_size = "N/A"
         if media_item:
+            media_title = media_item.display_name
+
+            # For TV shows, include show title
+            if media_item.type == "episode" and media_item.show_id:
+                show = get_show(media_item.show_id)
+                if show:
+                    media_title = f"{show.title} - {media_item.display_name}"
+
             # Get file size in a human-readable format
-            try:
-                file_size_bytes = os.path.getsize(media_item.path)
+            file_stat = _stat_or_none(media_item.path)
+            if file_stat is not None:
+                file_size_bytes = file_stat.st_size
                 file_size = format_file_size(file_size_bytes)
 
                 # If job is completed and has output path, show both sizes and compression percentage
-                if (
-                    job.status == "completed"
-                    and job.output_path
-                    and os.path.exists(job.output_path)
-                ):
-                    output_size_bytes = os.path.getsize(job.output_path)
+                output_stat = (
+                    _stat_or_none(job.output_path)
+                    if job.status == "completed" and job.output_path
+                    else None
+                )
+                if output_stat is not None:
+                    output_size_bytes = output_stat.st_size
                     output_size = format_file_size(output_size_bytes)
 
                     # Calculate compression percentage
@@ -172,64 +244,15 @@ def jobs():
                         )
                         file_size = f"{file_size} → {output_size} ({compression_pct:.1f}% smaller)"
 
-                # For TV shows, include show title
-                if media_item.type == "episode" and media_item.show_id:
-                    show = get_show(media_item.show_id)
-                    if show:
-                        media_title = f"{show.title} - {media_item.display_name}"
-                    else:
-                        media_title = media_item.display_name
-                else:
-                    media_title = media_item.display_name
-
-                job_data = {
-                    "job": job,
-                    "media_title": media_title,
-                    "file_size": file_size,
-                }
-
-                # Categorize job by status
-                if job.status in ["processing", "pending"]:
-                    active_jobs.append(job_data)
-                elif job.status == "completed":
-                    completed_jobs.append(job_data)
-                else:  # failed or cancelled
-                    failed_jobs.append(job_data)
-
-            except (FileNotFoundError, OSError):
-                # Handle case where file doesn't exist or can't be accessed
-                job_data = {
-                    "job": job,
-                    "media_title": media_item.display_name if media_item else "Unknown",
-                    "file_size": "N/A",
-                }
-
-                # Categorize job by status
-                if job.status in ["processing", "pending"]:
-                    active_jobs.append(job_data)
-                elif job.status == "completed":
-                    completed_jobs.append(job_data)
-                else:  # failed or cancelled
-                    failed_jobs.append(job_data)
-        else:
-            job_data = {"job": job, "media_title": "Unknown", "file_size": "N/A"}
-
-            # Categorize job by status
-            if job.status in ["processing", "pending"]:
-                active_jobs.append(job_data)
-            elif job.status == "completed":
-                completed_jobs.append(job_data)
-            else:  # failed or cancelled
-                failed_jobs.append(job_data)
-
-    # Sort active jobs to put processing ones first, then pending ones
-    active_jobs.sort(key=lambda x: 0 if x["job"].status == "processing" else 1)
+        groups[_JOB_GROUPS.get(job.status, "failed")].append(
+            {"job": job, "media_title": media_title, "file_size": file_size}
+        )
 
     return render_template(
         "ui/jobs.html",
-        active_jobs=active_jobs,
-        completed_jobs=completed_jobs,
-        failed_jobs=failed_jobs,
+        active_jobs=groups["processing"] + groups["pending"],
+        completed_jobs=groups["completed"],
+        failed_jobs=groups["failed"],
     )
 
 
@@ -268,13 +291,18 @@ def completed():
 
     # Add original file size and compression details
     for transcode in completed_transcodes:
-        if "original_path" in transcode and os.path.exists(transcode["original_path"]):
+        original_stat = (
+            _stat_or_none(transcode["original_path"])
+            if "original_path" in transcode
+            else None
+        )
+        if original_stat is not None:
             # Get original file size
-            original_size_bytes = os.path.getsize(transcode["original_path"])
+            original_size_bytes = original_stat.st_size
             original_size = format_file_size(original_size_bytes)
 
-            # Get transcoded file size
-            output_size_bytes = os.path.getsize(transcode["file_path"])
+            # Transcoded file size comes from the directory scan
+            output_size_bytes = transcode["output_size_bytes"]
             output_size = format_file_size(output_size_bytes)
 
             # Calculate compression percentage
@@ -296,22 +324,28 @@ def download_file(filename):
     """Serve a file for download."""
     # Load config to get transcode path
     config = load_config()
-    transcode_path = config.transcode_path
 
-    # Apply path mappings to transcode_path
-    transcode_path = apply_output_path_mapping(transcode_path)
+    # Apply path mappings to transcode_path and resolve its real location
+    transcode_path, real_transcode_path = _transcode_roots(
+        config.transcode_path, get_config_version()
+    )
+
+    file_path = os.path.normpath(os.path.join(transcode_path, filename))
 
-    file_path = os.path.join(transcode_path, filename)
+    # Reject names that escape transcode_path before touching the filesystem
+    if os.path.dirname(file_path) != transcode_path:
+        flash("Invalid file path")
+        return redirect(url_for("ui.completed"))
 
     # Verify the file exists and is within transcode_path
-    if not os.path.exists(file_path) or not os.path.isfile(file_path):
+    file_stat = _stat_or_none(file_path)
+    if file_stat is None or not stat.S_ISREG(file_stat.st_mode):
         flash("File not found")
         return redirect(url_for("ui.completed"))
 
-    # Security check - make sure the file is in the transcode directory
-    real_transcode_path = os.path.realpath(transcode_path)
+    # Security check - make sure symlinks don't lead out of the transcode directory
     real_file_path = os.path.realpath(file_path)
-    if not real_file_path.startswith(real_transcode_path):
+    if os.path.commonpath([real_file_path, real_transcode_path]) != real_transcode_path:
         flash("Invalid file path")
         return redirect(url_for("ui.completed"))
 
@@ -328,11 +362,8 @@ def download_episode(media_id):
         return redirect(url_for("ui.index"))
 
     # Verify the episode file exists
-    if (
-        not media_item.path
-        or not os.path.exists(media_item.path)
-        or not os.path.isfile(media_item.path)
-    ):
+    file_stat = _stat_or_none(media_item.path) if media_item.path else None
+    if file_stat is None or not stat.S_ISREG(file_stat.st_mode):
         flash("Episode file not found")
         if media_item.show_id:
             return redirect(url_for("ui.show_detail", show_id=media_item.show_id))
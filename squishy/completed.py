@@ -1,46 +1,69 @@
 """Module for handling completed transcodes."""
 
 import os
-import json
-import glob
 import logging
+from functools import lru_cache
 from typing import List, Dict, Any, Tuple
 from datetime import datetime
 
+import orjson
+
 from squishy.transcoder import apply_output_path_mapping
 
+
+@lru_cache(maxsize=1024)
+def _read_sidecar(sidecar_path: str, mtime_ns: int) -> Dict[str, Any]:
+    """Parse a sidecar file; keyed by mtime so rewritten sidecars are re-read."""
+    with open(sidecar_path, "rb") as f:
+        metadata = orjson.loads(f.read())
+
+    # Parse completed_at date for sorting
+    if "completed_at" in metadata:
+        try:
+            completed_at = datetime.fromisoformat(metadata["completed_at"])
+            metadata["completed_at_datetime"] = completed_at
+        except (ValueError, TypeError):
+            metadata["completed_at_datetime"] = datetime.fromtimestamp(0)
+
+    return metadata
+
+
 def get_completed_transcodes(transcode_path: str) -> List[Dict[str, Any]]:
     """Get all completed transcodes with metadata."""
     # Apply path mappings to transcode_path
     transcode_path = apply_output_path_mapping(transcode_path)
     
-    # Find all JSON sidecar files
-    sidecar_files = glob.glob(os.path.join(transcode_path, "*.json"))
+    # Read the directory once; the entries answer existence checks for the
+    # media files next to each JSON sidecar without stat'ing them separately
+    try:
+        with os.scandir(transcode_path) as it:
+            entries = {entry.name: entry for entry in it}
+    except FileNotFoundError:
+        return []
+    except OSError as e:
+        logging.error(f"Error listing transcode directory {transcode_path}: {e}")
+        return []
 
     completed = []
-    for sidecar_path in sidecar_files:
+    for name, entry in entries.items():
+        if name.startswith(".") or not name.endswith(".json"):
+            continue
+        sidecar_path = entry.path
         try:
             # Check if the media file exists
-            media_path = sidecar_path[:-5]  # Remove .json extension
-            if not os.path.exists(media_path):
+            media_entry = entries.get(name[:-5])  # Remove .json extension
+            if media_entry is None or not media_entry.is_file():
                 continue
+            media_path = media_entry.path
 
-            # Read metadata from sidecar file
-            with open(sidecar_path, "r") as f:
-                metadata = json.load(f)
+            # Read metadata from sidecar file, copied so the page can add to it
+            metadata = dict(_read_sidecar(sidecar_path, entry.stat().st_mtime_ns))
 
             # Add file path and name
             metadata["file_path"] = media_path
             metadata["file_name"] = os.path.basename(media_path)
             metadata["sidecar_path"] = sidecar_path
-
-            # Parse completed_at date for sorting
-            if "completed_at" in metadata:
-                try:
-                    completed_at = datetime.fromisoformat(metadata["completed_at"])
-                    metadata["completed_at_datetime"] = completed_at
-                except (ValueError, TypeError):
-                    metadata["completed_at_datetime"] = datetime.fromtimestamp(0)
+            metadata["output_size_bytes"] = media_entry.stat().st_size
 
             completed.append(metadata)
         except Exception as e:
@@ -74,7 +97,12 @@ def delete_transcode(filename: str, transcode_path: str) -> Tuple[bool, str]:
     real_file_path = os.path.realpath(file_path)
     real_sidecar_path = os.path.realpath(sidecar_path)
 
-    if not real_file_path.startswith(real_transcode_path) or not real_sidecar_path.startswith(real_transcode_path):
+    # commonpath compares whole components, so a sibling such as
+    # /transcodes_other doesn't pass for /transcodes
+    if (
+        os.path.commonpath([real_file_path, real_transcode_path]) != real_transcode_path
+        or os.path.commonpath([real_sidecar_path, real_transcode_path]) != real_transcode_path
+    ):
         return False, "Security error: File path is outside the transcode directory"
 
     # Check if files exist
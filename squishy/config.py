@@ -1,13 +1,26 @@
 """Configuration module for Squishy."""
 
-import json
 import os
+import sys
+import time
 import logging
-from dataclasses import dataclass
-from typing import Dict, Optional, Any
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field, replace
+from functools import lru_cache
+from typing import Dict, Optional, Any, Tuple
 
+import orjson
 
-@dataclass
+# Default config file location, resolved once from the environment at import
+CONFIG_PATH = os.path.normpath(os.environ.get("CONFIG_PATH", "./config/config.json"))
+
+# Slotted dataclasses need Python 3.10; older interpreters keep __dict__
+_CONFIG_DATACLASS_OPTIONS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_CONFIG_DATACLASS_OPTIONS)
 class Config:
     """Main application configuration."""
 
@@ -19,24 +32,15 @@ class Config:
     jellyfin_api_key: Optional[str] = None
     plex_url: Optional[str] = None
     plex_token: Optional[str] = None
-    path_mappings: Dict[str, str] = None  # Dictionary of source path -> target path mappings
-    presets: Dict[str, Dict[str, Any]] = None  # Using effeffmpeg presets directly
+    path_mappings: Dict[str, str] = field(default_factory=dict)  # Dictionary of source path -> target path mappings
+    presets: Dict[str, Dict[str, Any]] = field(default_factory=dict)  # Using effeffmpeg presets directly
     max_concurrent_jobs: int = 1  # Default to 1 concurrent job
     hw_accel: Optional[str] = None  # Global hardware acceleration method
     hw_device: Optional[str] = None  # Global hardware acceleration device
     hw_capabilities: Optional[Dict[str, Any]] = None  # Hardware capabilities JSON data
-    enabled_libraries: Dict[str, bool] = None  # Dictionary of library_id -> enabled status
+    enabled_libraries: Dict[str, bool] = field(default_factory=dict)  # Dictionary of library_id -> enabled status
     log_level: str = "INFO"  # Application log level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
     secret_key: Optional[str] = None  # Flask session secret key
-    
-    def __post_init__(self):
-        """Ensure dictionaries are initialized."""
-        if self.presets is None:
-            self.presets = {}
-        if self.path_mappings is None:
-            self.path_mappings = {}
-        if self.enabled_libraries is None:
-            self.enabled_libraries = {}
 
 
 def is_first_run(config_path: str = None) -> bool:
@@ -51,7 +55,7 @@ def is_first_run(config_path: str = None) -> bool:
         bool: True if this is the first run, False otherwise
     """
     if config_path is None:
-        config_path = os.environ.get("CONFIG_PATH", "./config/config.json")
+        config_path = CONFIG_PATH
     
     # If the config file doesn't exist, this is the first run
     if not os.path.exists(config_path):
@@ -59,8 +63,8 @@ def is_first_run(config_path: str = None) -> bool:
     
     # If the config file exists, check if a media server is configured
     try:
-        with open(config_path, "r") as f:
-            config_data = json.load(f)
+        with open(config_path, "rb") as f:
+            config_data = orjson.loads(f.read())
             
         # Check if either Jellyfin or Plex is configured
         has_jellyfin = config_data.get("jellyfin_url") and config_data.get("jellyfin_api_key")
@@ -68,64 +72,133 @@ def is_first_run(config_path: str = None) -> bool:
         
         # If neither is configured, this is still considered a first run
         return not (has_jellyfin or has_plex)
-    except (json.JSONDecodeError, IOError):
+    except (orjson.JSONDecodeError, IOError):
         # If the file exists but can't be read or parsed, consider it a first run
         return True
 
 
 def load_config(config_path: str = None) -> Config:
-    """Load configuration from a JSON file."""
+    """Load configuration from a JSON file.
+
+    The parsed file is cached until its modification time changes or
+    save_config() writes a new one, so each caller gets a copy it can
+    modify without affecting the cached config.
+    """
     if config_path is None:
-        config_path = os.environ.get("CONFIG_PATH", "./config/config.json")
-        
-    # Check if the config directory exists, create it if not
-    config_dir = os.path.dirname(config_path)
-    if not os.path.exists(config_dir):
-        os.makedirs(config_dir, exist_ok=True)
+        config_path = CONFIG_PATH
+
+    # A config queued by save_config_async() is newer than the file on disk
+    config = _PENDING_SAVES.get(config_path)
+    if config is None:
+        try:
+            mtime = os.stat(config_path).st_mtime_ns
+        except OSError:
+            mtime = None
+        config = _load_config_cached(config_path, mtime)
+    return _copy_config(config)
+
+
+def _copy_config(config: Config) -> Config:
+    """Copy a config along with the dictionaries callers modify in place."""
+    return replace(
+        config,
+        presets=dict(config.presets),
+        path_mappings=dict(config.path_mappings),
+        enabled_libraries=dict(config.enabled_libraries),
+    )
+
+
+_CONFIG_GENERATION_LOCK = threading.Lock()
+
+# Bumped by every save, so changes are visible before a background write lands
+_CONFIG_GENERATION = 0
 
-    # Default presets that will be used if none are defined in the config
-    default_presets = {
-        "high": {
-            "codec": "hevc",
-            "scale": "1080p",
-            "container": ".mkv",
-            "audio_codec": "aac",
-            "audio_bitrate": "192k",
-            "crf": 20,
-            "allow_fallback": True
-        },
-        "medium": {
-            "codec": "hevc",
-            "scale": "720p",
-            "container": ".mkv",
-            "audio_codec": "aac",
-            "audio_bitrate": "128k",
-            "crf": 24,
-            "allow_fallback": True
-        },
-        "low": {
-            "codec": "hevc",
-            "scale": "480p",
-            "container": ".mkv",
-            "audio_codec": "aac",
-            "audio_bitrate": "96k",
-            "crf": 28,
-            "allow_fallback": True
-        }
-    }
 
-    # Use default configuration as a fallback if config file doesn't exist
-    default_config = {
-        "media_path": "/media",
-        "transcode_path": "/transcodes",
-        "ffmpeg_path": "/usr/bin/ffmpeg",
-        "ffprobe_path": "/usr/bin/ffprobe",
-        "path_mappings": {},
-        "presets": default_presets,
-        # Default to Jellyfin settings to encourage configuration
-        "jellyfin_url": "",
-        "jellyfin_api_key": "",
+def _mark_config_changed() -> None:
+    """Advance the config generation reported by get_config_version()."""
+    global _CONFIG_GENERATION
+    with _CONFIG_GENERATION_LOCK:
+        _CONFIG_GENERATION += 1
+
+
+def get_config_version(config_path: str = None) -> Tuple[int, Optional[int]]:
+    """
+    Get a token that changes whenever the configuration changes.
+
+    Combines the in-process save generation with the file mtime, so edits
+    made to the file outside the app are noticed too.
+    """
+    if config_path is None:
+        config_path = CONFIG_PATH
+
+    try:
+        mtime = os.stat(config_path).st_mtime_ns
+    except OSError:
+        mtime = None
+    return _CONFIG_GENERATION, mtime
+
+
+@lru_cache(maxsize=4)
+def _load_config_cached(config_path: str, mtime_ns: Optional[int]) -> Config:
+    """Parse the config file, keyed by path and mtime so edits are picked up."""
+    return _read_config(config_path)
+
+
+# Default presets that will be used if none are defined in the config
+_DEFAULT_PRESETS = {
+    "high": {
+        "codec": "hevc",
+        "scale": "1080p",
+        "container": ".mkv",
+        "audio_codec": "aac",
+        "audio_bitrate": "192k",
+        "crf": 20,
+        "allow_fallback": True
+    },
+    "medium": {
+        "codec": "hevc",
+        "scale": "720p",
+        "container": ".mkv",
+        "audio_codec": "aac",
+        "audio_bitrate": "128k",
+        "crf": 24,
+        "allow_fallback": True
+    },
+    "low": {
+        "codec": "hevc",
+        "scale": "480p",
+        "container": ".mkv",
+        "audio_codec": "aac",
+        "audio_bitrate": "96k",
+        "crf": 28,
+        "allow_fallback": True
     }
+}
+
+# Default configuration used as a fallback if the config file doesn't exist
+_DEFAULT_CONFIG = {
+    "media_path": "/media",
+    "transcode_path": "/transcodes",
+    "ffmpeg_path": "/usr/bin/ffmpeg",
+    "ffprobe_path": "/usr/bin/ffprobe",
+    "path_mappings": {},
+    # Default to Jellyfin settings to encourage configuration
+    "jellyfin_url": "",
+    "jellyfin_api_key": "",
+}
+
+
+def _default_presets() -> Dict[str, Dict[str, Any]]:
+    """Copy the default presets so callers can modify them safely."""
+    return {name: dict(preset) for name, preset in _DEFAULT_PRESETS.items()}
+
+
+def _read_config(config_path: str) -> Config:
+    """Read and parse the configuration file."""
+    # Check if the config directory exists, create it if not
+    config_dir = os.path.dirname(config_path)
+    if config_dir and not os.path.exists(config_dir):
+        os.makedirs(config_dir, exist_ok=True)
 
     if not os.path.exists(config_path):
         # Log that we're using default configuration
@@ -133,18 +206,18 @@ def load_config(config_path: str = None) -> Config:
             f"Config file not found at {config_path}, using default configuration"
         )
         logging.warning("Please configure either Jellyfin or Plex to use Squishy.")
-        config_data = default_config
+        config_data = dict(_DEFAULT_CONFIG, presets=_default_presets())
     else:
         # Load configuration from file
-        with open(config_path, "r") as f:
-            config_data = json.load(f)
+        with open(config_path, "rb") as f:
+            config_data = orjson.loads(f.read())
 
             # Ensure presets are defined
             if "presets" not in config_data or not config_data["presets"]:
                 logging.warning(
                     "No presets defined in config file, using default presets"
                 )
-                config_data["presets"] = default_presets
+                config_data["presets"] = _default_presets()
 
             # Ensure either Jellyfin or Plex is configured
             has_jellyfin = config_data.get("jellyfin_url") and config_data.get(
@@ -163,22 +236,22 @@ def load_config(config_path: str = None) -> Config:
         media_path = config_data["media_paths"][0]
 
     # Get path mappings
-    path_mappings = config_data.get("path_mappings", {})
+    path_mappings = config_data.get("path_mappings") or {}
 
     # Get enabled libraries (default all to True if not specified)
-    enabled_libraries = config_data.get("enabled_libraries", {})
+    enabled_libraries = config_data.get("enabled_libraries") or {}
 
     # Get presets
-    presets = config_data.get("presets", default_presets)
+    presets = config_data["presets"]
 
     return Config(
-        media_path=media_path or default_config["media_path"],
+        media_path=media_path or _DEFAULT_CONFIG["media_path"],
         transcode_path=config_data.get(
-            "transcode_path", default_config["transcode_path"]
+            "transcode_path", _DEFAULT_CONFIG["transcode_path"]
         ),
-        ffmpeg_path=config_data.get("ffmpeg_path", default_config["ffmpeg_path"]),
+        ffmpeg_path=config_data.get("ffmpeg_path", _DEFAULT_CONFIG["ffmpeg_path"]),
         ffprobe_path=config_data.get(
-            "ffprobe_path", default_config["ffprobe_path"]
+            "ffprobe_path", _DEFAULT_CONFIG["ffprobe_path"]
         ),
         jellyfin_url=config_data.get("jellyfin_url"),
         jellyfin_api_key=config_data.get("jellyfin_api_key"),
@@ -201,8 +274,17 @@ def load_config(config_path: str = None) -> Config:
 def save_config(config: Config, config_path: str = None) -> None:
     """Save configuration to a JSON file."""
     if config_path is None:
-        config_path = os.environ.get("CONFIG_PATH", "./config/config.json")
+        config_path = CONFIG_PATH
+
+    with _CONFIG_WRITE_LOCK:
+        # This config supersedes anything save_config_async() has queued
+        with _PENDING_SAVES_LOCK:
+            _PENDING_SAVES.pop(config_path, None)
+        _write_config(config, config_path)
+
 
+def _write_config(config: Config, config_path: str) -> None:
+    """Serialize a config and write it to disk if it changed."""
     # Generate a secret key if one doesn't exist
     if not config.secret_key:
         import secrets
@@ -233,5 +315,105 @@ def save_config(config: Config, config_path: str = None) -> None:
         config_data["plex_url"] = config.plex_url
         config_data["plex_token"] = config.plex_token
 
-    with open(config_path, "w") as f:
-        json.dump(config_data, f, indent=2)
\ No newline at end of file
+    serialized = orjson.dumps(config_data, option=orjson.OPT_INDENT_2)
+
+    # Skip the write when nothing changed on disk
+    try:
+        with open(config_path, "rb") as f:
+            if f.read() == serialized:
+                return
+    except OSError:
+        pass
+
+    with open(config_path, "wb") as f:
+        f.write(serialized)
+
+    # Drop cached copies in case the write landed within the same mtime tick
+    _load_config_cached.cache_clear()
+    _mark_config_changed()
+
+
+@contextmanager
+def config_transaction(config_path: str = None):
+    """
+    Load the configuration, yield it for changes, and save it once on exit.
+
+    Several updates made inside the block share a single write; nothing is
+    saved if the block raises.
+    """
+    config = load_config(config_path)
+    yield config
+    save_config(config, config_path)
+
+
+# Configs queued by save_config_async(), keyed by path, and the paths that
+# already have a write scheduled
+_PENDING_SAVES: Dict[str, Config] = {}
+_SCHEDULED_SAVES = set()
+_PENDING_SAVES_LOCK = threading.Lock()
+_SAVE_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix="squishy-config")
+
+# Serializes config file writes, so a queued save can't land over a newer one
+_CONFIG_WRITE_LOCK = threading.Lock()
+
+# Saves arriving within this window are written once
+_SAVE_DEBOUNCE_SECONDS = 0.25
+
+# Delay before retrying a queued save that failed to write
+_SAVE_RETRY_SECONDS = 5.0
+
+
+def save_config_async(config: Config, config_path: str = None) -> None:
+    """
+    Save configuration in the background.
+
+    load_config() returns the new values immediately; the file is written
+    by a single background thread, and saves that arrive before it runs
+    are coalesced into one write.
+    """
+    if config_path is None:
+        config_path = CONFIG_PATH
+
+    with _PENDING_SAVES_LOCK:
+        _PENDING_SAVES[config_path] = _copy_config(config)
+        _mark_config_changed()
+        if config_path in _SCHEDULED_SAVES:
+            return
+        _SCHEDULED_SAVES.add(config_path)
+
+    _SAVE_EXECUTOR.submit(_flush_pending_save, config_path)
+
+
+def _flush_pending_save(config_path: str, delay: float = _SAVE_DEBOUNCE_SECONDS) -> None:
+    """Write the latest queued config for a path, retrying if the write fails."""
+    time.sleep(delay)
+
+    with _CONFIG_WRITE_LOCK:
+        with _PENDING_SAVES_LOCK:
+            # Saves queued from now on schedule another write; a synchronous
+            # save_config() since then has already dropped the entry
+            _SCHEDULED_SAVES.discard(config_path)
+            config = _PENDING_SAVES.get(config_path)
+
+        if config is None:
+            return
+
+        try:
+            _write_config(config, config_path)
+        except Exception as e:
+            # Leave the config queued so load_config() still serves it
+            logging.error(
+                f"Error saving config to {config_path}, retrying in "
+                f"{_SAVE_RETRY_SECONDS:g}s: {str(e)}"
+            )
+            with _PENDING_SAVES_LOCK:
+                if config_path in _SCHEDULED_SAVES or config_path not in _PENDING_SAVES:
+                    return
+                _SCHEDULED_SAVES.add(config_path)
+            _SAVE_EXECUTOR.submit(_flush_pending_save, config_path, _SAVE_RETRY_SECONDS)
+            return
+
+        # Keep serving a newer queued config until its own write lands
+        with _PENDING_SAVES_LOCK:
+            if _PENDING_SAVES.get(config_path) is config:
+                del _PENDING_SAVES[config_path]
@@ -11,30 +11,48 @@ It can be used as a CLI tool or imported as a module in other Python application
 import argparse
 import json
 import os
+import platform
 import re
+import selectors
+import shutil
 import subprocess
 import sys
 import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple, Union, Any, Callable, BinaryIO
 
-def run_command(command: str) -> Tuple[bool, str]:
+def run_command(command: Union[List[str], str]) -> Tuple[bool, str]:
     """
-    Run a shell command and return the success status and output.
+    Run a command and return the success status and output.
 
     Args:
-        command: The shell command to execute
+        command: The command as an argv list, which is executed directly.
+            A string is still accepted and run through the shell for
+            backwards compatibility, at the cost of an extra /bin/sh process.
 
     Returns:
         A tuple containing (success_status, command_output)
     """
     try:
-        result = subprocess.run(command, shell=True, check=True,
+        result = subprocess.run(command, shell=isinstance(command, str), check=True,
                                 stdout=subprocess.PIPE, stderr=subprocess.PIPE)
         return True, result.stderr.decode()
     except subprocess.CalledProcessError as e:
         return False, e.stderr.decode()
+    except OSError as e:
+        # The executable is missing or not runnable
+        return False, str(e)
+
+# Named scales and their (width, height) in pixels
+_RESOLUTIONS = {
+    "360p": (640, 360),
+    "480p": (854, 480),
+    "720p": (1280, 720),
+    "1080p": (1920, 1080),
+    "2160p": (3840, 2160)
+}
 
 def parse_resolution(res: str) -> Tuple[int, int]:
     """
@@ -46,16 +64,10 @@ def parse_resolution(res: str) -> Tuple[int, int]:
     Returns:
         A tuple of (width, height) in pixels
     """
-    presets = {
-        "360p": (640, 360),
-        "480p": (854, 480),
-        "720p": (1280, 720),
-        "1080p": (1920, 1080),
-        "2160p": (3840, 2160)
-    }
-    return presets.get(res, (1280, 720))
+    return _RESOLUTIONS.get(res, (1280, 720))
 
-def validate_quality_options(encoder, crf, bitrate, audio_codec, audio_bitrate, flac_compression, context="CLI flag", quiet=False):
+def validate_quality_options(encoder, crf, bitrate, audio_codec, audio_bitrate, flac_compression, context="CLI flag", quiet=False,
+                             _errors: Optional[List[str]] = None):
     """
     Validate encoding quality options for consistency and correctness.
 
@@ -68,11 +80,12 @@ def validate_quality_options(encoder, crf, bitrate, audio_codec, audio_bitrate,
         flac_compression: FLAC compression level
         context: Context for error messages ("CLI flag" or "preset")
         quiet: Whether to suppress error messages
+        _errors: If given, errors are appended to this list instead of raised
 
     Raises:
-        ValueError: If any validation fails
+        ValueError: If any validation fails and _errors is not given
     """
-    errors = []
+    errors = [] if _errors is None else _errors
 
     # Only validate CRF if it's provided
     if crf is not None:
@@ -102,13 +115,25 @@ def validate_quality_options(encoder, crf, bitrate, audio_codec, audio_bitrate,
         if audio_codec != "flac":
             errors.append(f"FLAC compression is only valid when audio codec is 'flac'. Selected: '{audio_codec}'")
 
-    if errors:
+    if errors and _errors is None:
         error_msg = f"Invalid {context} settings:" + "".join(f"\n- {e}" for e in errors)
         if not quiet:
             print(f"[✗] {error_msg}")
         raise ValueError(error_msg)
 
-def validate_codecs(container, video_codec, audio_codec, context="CLI flag", quiet=False):
+# Codecs each container accepts, and the (video, audio) defaults for it.
+# Tuples keep the order used in error messages.
+_CODEC_MATRIX = {
+    ".mp4": {"video": ("h264", "hevc"), "audio": ("aac", "copy"), "default": ("h264", "aac")},
+    ".mkv": {"video": ("h264", "hevc", "vp9"), "audio": ("aac", "flac", "opus", "libopus", "copy"), "default": ("hevc", "aac")},
+    ".webm": {"video": ("vp9", "av1"), "audio": ("opus", "libopus"), "default": ("vp9", "libopus")},
+    ".mov": {"video": ("h264", "hevc"), "audio": ("aac", "copy"), "default": ("h264", "aac")}
+}
+
+_VALID_SCALES = frozenset(_RESOLUTIONS)
+
+def validate_codecs(container, video_codec, audio_codec, context="CLI flag", quiet=False,
+                    _errors: Optional[List[str]] = None):
     """
     Validate codec compatibility with container format.
 
@@ -118,18 +143,13 @@ def validate_codecs(container, video_codec, audio_codec, context="CLI flag", qui
         audio_codec: Audio codec to use
         context: Context for error messages ("CLI flag" or "preset")
         quiet: Whether to suppress error messages
+        _errors: If given, errors are appended to this list instead of raised
 
     Raises:
-        ValueError: If any validation fails
+        ValueError: If any validation fails and _errors is not given
     """
-    matrix = {
-        ".mp4": {"video": ["h264", "hevc"], "audio": ["aac", "copy"], "default": ("h264", "aac")},
-        ".mkv": {"video": ["h264", "hevc", "vp9"], "audio": ["aac", "flac", "opus", "libopus", "copy"], "default": ("hevc", "aac")},
-        ".webm": {"video": ["vp9", "av1"], "audio": ["opus", "libopus"], "default": ("vp9", "libopus")},
-        ".mov": {"video": ["h264", "hevc"], "audio": ["aac", "copy"], "default": ("h264", "aac")}
-    }
-
-    errors = []
+    matrix = _CODEC_MATRIX
+    errors = [] if _errors is None else _errors
 
     if container not in matrix:
         errors.append(f"Unsupported container format '{container}'. Allowed: {', '.join(matrix)}")
@@ -143,7 +163,7 @@ def validate_codecs(container, video_codec, audio_codec, context="CLI flag", qui
         if audio_codec not in valid_audio:
             errors.append(f"Invalid audio codec '{audio_codec}' for '{container}'. Valid: {', '.join(valid_audio)}")
 
-    if errors:
+    if errors and _errors is None:
         error_msg = f"Invalid {context} settings:" + "".join(f"\n- {e}" for e in errors)
         if not quiet:
             print(f"[✗] {error_msg}")
@@ -151,24 +171,20 @@ def validate_codecs(container, video_codec, audio_codec, context="CLI flag", qui
 
 def infer_defaults_from_extension(output_file):
     ext = Path(output_file).suffix.lower()
-    defaults = {
-        ".mp4": ("h264", "aac"),
-        ".mkv": ("hevc", "aac"),
-        ".webm": ("vp9", "libopus"),
-        ".mov": ("h264", "aac")
-    }
-    if ext not in defaults:
-        print(f"[✗] Unsupported container extension '{ext}'. Must be one of: {', '.join(defaults)}")
+    formats = _CODEC_MATRIX.get(ext)
+    if formats is None:
+        print(f"[✗] Unsupported container extension '{ext}'. Must be one of: {', '.join(_CODEC_MATRIX)}")
         sys.exit(1)
-    return ext, *defaults[ext]
+    return ext, *formats["default"]
 
-def validate_presets_data(presets_data, quiet=False):
+def validate_presets_data(presets_data, quiet=False, fail_fast=False):
     """
     Validate a dictionary of presets data.
 
     Args:
         presets_data: Dictionary containing preset configurations
         quiet: Whether to suppress error messages
+        fail_fast: Stop at the first problem instead of listing every one
 
     Returns:
         True if validation succeeds
@@ -184,17 +200,19 @@ def validate_presets_data(presets_data, quiet=False):
 
     # Validate all presets in the dictionary
     for name, config in presets_data.items():
-        validate_preset_config(name, config, quiet=quiet)
+        validate_preset_config(name, config, quiet=quiet, fail_fast=fail_fast)
     
     return True
 
-def load_presets(presets_file, quiet=False):
+def load_presets(presets_file, quiet=False, fail_fast=True):
     """
     Load presets from a JSON file.
 
     Args:
         presets_file: Path to the presets JSON file
         quiet: Whether to suppress error messages
+        fail_fast: Stop validating at the first problem (pass False to
+            report every problem in the file)
 
     Returns:
         Dictionary of preset configurations
@@ -205,12 +223,12 @@ def load_presets(presets_file, quiet=False):
         ValueError: If any preset configuration is invalid
     """
     try:
-        with open(presets_file, 'r') as f:
-            data = json.load(f)
+        with open(presets_file, 'rb') as f:
+            data = json.loads(f.read())
         presets = data.get('presets', {})
 
         # Validate all presets
-        validate_presets_data(presets, quiet=quiet)
+        validate_presets_data(presets, quiet=quiet, fail_fast=fail_fast)
 
         return presets
     except FileNotFoundError:
@@ -229,7 +247,8 @@ def validate_config(
     name="Configuration",
     context="configuration",
     quiet=False,
-    check_container=True
+    check_container=True,
+    fail_fast=False
 ):
     """
     Validate a configuration (preset or command-line options).
@@ -243,6 +262,7 @@ def validate_config(
         context: Context for error messages
         quiet: Whether to suppress error messages
         check_container: Whether to check for container field (required for presets only)
+        fail_fast: Raise on the first failing check instead of collecting every error
 
     Raises:
         ValueError: If any validation fails
@@ -253,62 +273,56 @@ def validate_config(
     container = config.get('container')
     if check_container and not container:
         errors.append("Missing required 'container' field.")
+        if fail_fast:
+            _raise_config_errors(errors, name, context, quiet)
 
     # Validate codec compatibility
     if container and 'codec' in config and config['codec'] is not None and 'audio_codec' in config and config['audio_codec'] is not None:
-        try:
-            validate_codecs(
-                container=container,
-                video_codec=config['codec'],
-                audio_codec=config['audio_codec'],
-                context=context,
-                quiet=True  # Suppress output, we'll collect the error
-            )
-        except ValueError as e:
-            # Extract the error message excluding the "Invalid settings:" prefix
-            error_msg = str(e)
-            if "Invalid" in error_msg and ":" in error_msg:
-                error_details = error_msg.split(":", 1)[1].strip()
-                for line in error_details.split("\n"):
-                    if line.startswith("- "):
-                        errors.append(line[2:])  # Remove the "- " prefix
+        validate_codecs(
+            container=container,
+            video_codec=config['codec'],
+            audio_codec=config['audio_codec'],
+            context=context,
+            quiet=True,  # Suppress output, we'll collect the errors
+            _errors=errors
+        )
+        if fail_fast and errors:
+            _raise_config_errors(errors, name, context, quiet)
 
     # Validate scale
     scale = config.get('scale')
-    if scale is not None and scale not in ["360p", "480p", "720p", "1080p", "2160p"]:
+    if scale is not None and (not isinstance(scale, str) or scale not in _VALID_SCALES):
         errors.append(f"Invalid scale '{scale}'. Valid values: 360p, 480p, 720p, 1080p, 2160p")
+        if fail_fast:
+            _raise_config_errors(errors, name, context, quiet)
 
     # Validate quality options
-    try:
-        validate_quality_options(
-            encoder=None,  # We don't know the encoder here
-            crf=config.get('crf'),
-            bitrate=config.get('bitrate'),
-            audio_codec=config.get('audio_codec'),
-            audio_bitrate=config.get('audio_bitrate'),
-            flac_compression=config.get('flac_compression'),
-            context=context,
-            quiet=True  # Suppress output, we'll collect the error
-        )
-    except ValueError as e:
-        # Extract the error message excluding the "Invalid settings:" prefix
-        error_msg = str(e)
-        if "Invalid" in error_msg and ":" in error_msg:
-            error_details = error_msg.split(":", 1)[1].strip()
-            for line in error_details.split("\n"):
-                if line.startswith("- "):
-                    errors.append(line[2:])  # Remove the "- " prefix
+    validate_quality_options(
+        encoder=None,  # We don't know the encoder here
+        crf=config.get('crf'),
+        bitrate=config.get('bitrate'),
+        audio_codec=config.get('audio_codec'),
+        audio_bitrate=config.get('audio_bitrate'),
+        flac_compression=config.get('flac_compression'),
+        context=context,
+        quiet=True,  # Suppress output, we'll collect the errors
+        _errors=errors
+    )
 
     if errors:
-        error_msg = f"Invalid {context} '{name}':" + "".join(f"\n- {e}" for e in errors)
-        if not quiet:
-            print(f"[✗] {error_msg}")
-        raise ValueError(error_msg)
+        _raise_config_errors(errors, name, context, quiet)
 
     return True
 
+def _raise_config_errors(errors, name, context, quiet):
+    """Raise a ValueError listing the collected validation errors."""
+    error_msg = f"Invalid {context} '{name}':" + "".join(f"\n- {e}" for e in errors)
+    if not quiet:
+        print(f"[✗] {error_msg}")
+    raise ValueError(error_msg)
+
 
-def validate_preset_config(preset_name, config, quiet=False):
+def validate_preset_config(preset_name, config, quiet=False, fail_fast=False):
     """
     Validate a preset configuration.
 
@@ -316,6 +330,7 @@ def validate_preset_config(preset_name, config, quiet=False):
         preset_name: Name of the preset
         config: Preset configuration dictionary
         quiet: Whether to suppress error messages
+        fail_fast: Raise on the first failing check instead of collecting every error
 
     Raises:
         ValueError: If any validation fails
@@ -325,18 +340,81 @@ def validate_preset_config(preset_name, config, quiet=False):
         name=preset_name,
         context="preset",
         quiet=quiet,
-        check_container=True
+        check_container=True,
+        fail_fast=fail_fast
     )
 
-def detect_capabilities(ffmpeg_path: str = "ffmpeg", quiet: bool = False) -> Dict[str, Any]:
+# Number of (ffmpeg, device, kernel) combinations kept in the capabilities cache
+CAPABILITIES_CACHE_ENTRIES = 8
+
+def _capabilities_cache_file() -> Path:
+    """Return the file detect_capabilities() stores its results in."""
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return Path(cache_home) / "effeffmpeg" / "capabilities.json"
+
+def _capabilities_cache_key(ffmpeg_path: str, device: str) -> Optional[str]:
+    """
+    Build the cache key for a detection run.
+
+    The key changes when the ffmpeg binary is replaced or upgraded, when a
+    different device is probed, or when the kernel (and so its drivers) changes.
+    Returns None if the ffmpeg binary can't be found.
+    """
+    resolved = shutil.which(ffmpeg_path) or ffmpeg_path
+    try:
+        st = os.stat(resolved)
+    except OSError:
+        return None
+    return "|".join([
+        os.path.realpath(resolved), str(st.st_mtime_ns), str(st.st_size),
+        device, platform.release()
+    ])
+
+def _load_capabilities_cache() -> Dict[str, Any]:
+    """Load the capabilities cache, returning an empty one if it is unreadable."""
+    try:
+        with open(_capabilities_cache_file(), 'rb') as f:
+            cache = json.loads(f.read())
+    except (OSError, ValueError):
+        return {}
+    return cache if isinstance(cache, dict) else {}
+
+def _store_capabilities_cache(key: str, capabilities: Dict[str, Any]) -> None:
+    """Record detected capabilities, keeping only the most recent entries."""
+    cache = _load_capabilities_cache()
+    cache.pop(key, None)
+    cache[key] = capabilities
+    while len(cache) > CAPABILITIES_CACHE_ENTRIES:
+        del cache[next(iter(cache))]
+
+    cache_file = _capabilities_cache_file()
+    tmp_file = cache_file.with_name(f"{cache_file.name}.{os.getpid()}.tmp")
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp_file, 'w') as f:
+            json.dump(cache, f, indent=2)
+        os.replace(tmp_file, cache_file)
+    except OSError:
+        # Caching is best effort; detection still succeeded
+        try:
+            os.remove(tmp_file)
+        except OSError:
+            pass
+
+def detect_capabilities(ffmpeg_path: str = "ffmpeg", quiet: bool = False,
+                        force_refresh: bool = False) -> Dict[str, Any]:
     """
     Detect hardware acceleration capabilities on the system.
 
     Tests for VAAPI hardware encoders by running small FFmpeg test commands.
+    Results are cached under ~/.cache/effeffmpeg (or $XDG_CACHE_HOME) and
+    reused until the ffmpeg binary or kernel changes, so the test encodes
+    only run once per setup.
 
     Args:
         ffmpeg_path: Path to the ffmpeg executable
         quiet: If True, suppresses console output during detection
+        force_refresh: If True, ignore cached results and probe again
 
     Returns:
         A dictionary containing detected capabilities:
@@ -366,24 +444,34 @@ def detect_capabilities(ffmpeg_path: str = "ffmpeg", quiet: bool = False) -> Dic
             print(f"[✗] VAAPI device {device} does not exist.")
         return capabilities
 
+    cache_key = _capabilities_cache_key(ffmpeg_path, device)
+    if cache_key is not None and not force_refresh:
+        cached = _load_capabilities_cache().get(cache_key)
+        if isinstance(cached, dict):
+            if not quiet:
+                print(f"Using cached capabilities from {_capabilities_cache_file()}")
+            return cached
+
     # Use the provided ffmpeg path
     tests = {
-        "h264_vaapi": (
-            f"{ffmpeg_path} -hide_banner -init_hw_device vaapi=va:{device} -filter_hw_device va "
-            f"-f lavfi -i testsrc=duration=1:size=1280x720:rate=30 -vf 'format=nv12,hwupload' "
-            f"-c:v h264_vaapi -t 1 -f null -"
-        ),
-        "hevc_vaapi": (
-            f"{ffmpeg_path} -hide_banner -init_hw_device vaapi=va:{device} -filter_hw_device va "
-            f"-f lavfi -i testsrc=duration=1:size=1280x720:rate=30 -vf 'format=nv12,hwupload' "
-            f"-c:v hevc_vaapi -t 1 -f null -"
-        )
+        encoder: [
+            ffmpeg_path, "-hide_banner", "-init_hw_device", f"vaapi=va:{device}", "-filter_hw_device", "va",
+            "-f", "lavfi", "-i", "testsrc=duration=1:size=1280x720:rate=30", "-vf", "format=nv12,hwupload",
+            "-c:v", encoder, "-t", "1", "-f", "null", "-"
+        ]
+        for encoder in ("h264_vaapi", "hevc_vaapi")
     }
 
-    for encoder, cmd in tests.items():
-        if not quiet:
+    if not quiet:
+        for encoder in tests:
             print(f"Testing {encoder}...")
-        success, output = run_command(cmd)
+
+    # The probes are independent, so run them side by side; map() keeps the
+    # results in test order
+    with ThreadPoolExecutor(max_workers=len(tests)) as executor:
+        results = list(executor.map(run_command, tests.values()))
+
+    for encoder, (success, output) in zip(tests, results):
         if success:
             if not quiet:
                 print(f"[✓] {encoder} supported")
@@ -392,8 +480,96 @@ def detect_capabilities(ffmpeg_path: str = "ffmpeg", quiet: bool = False) -> Dic
         elif not quiet:
             print(f"[✗] {encoder} not supported:\n{output.strip()}\n")
 
+    if cache_key is not None:
+        _store_capabilities_cache(cache_key, capabilities)
+
     return capabilities
 
+# Number of probed durations kept in memory
+DURATION_CACHE_ENTRIES = 512
+
+# Durations found by _cached_duration(), keyed by (path, mtime_ns)
+_DURATION_CACHE: Dict[Tuple[str, int], float] = {}
+_DURATION_CACHE_LOCK = threading.Lock()
+
+def _cached_duration(input_file: str, debug: bool = False) -> Optional[float]:
+    """
+    Get the duration of a media file, reusing a previous probe of it.
+
+    Durations are cached per path and modification time, so transcoding
+    one input to several presets only probes it once. Failures aren't
+    cached, so a file that couldn't be probed is tried again next time.
+    """
+    try:
+        key = (input_file, os.stat(input_file).st_mtime_ns)
+    except OSError:
+        # Not a local file (e.g. a URL), so there's no key to cache on
+        return _probe_duration(input_file, debug)
+
+    with _DURATION_CACHE_LOCK:
+        duration = _DURATION_CACHE.get(key)
+    if duration is not None:
+        return duration
+
+    duration = _probe_duration(input_file, debug)
+    if duration is not None:
+        with _DURATION_CACHE_LOCK:
+            if len(_DURATION_CACHE) >= DURATION_CACHE_ENTRIES:
+                # Drop the oldest entry
+                del _DURATION_CACHE[next(iter(_DURATION_CACHE))]
+            _DURATION_CACHE[key] = duration
+    return duration
+
+def _probe_duration(input_file: str, debug: bool = False) -> Optional[float]:
+    """
+    Get the duration of a media file in seconds with a single ffprobe call.
+
+    Asks for both the container duration and the first video stream's
+    duration, and uses the first usable value.
+
+    Returns:
+        The duration in seconds, or None if it couldn't be determined
+    """
+    info_cmd = ["ffprobe", "-v", "error", "-select_streams", "v:0",
+                "-show_entries", "format=duration:stream=duration",
+                "-of", "default=noprint_wrappers=1:nokey=1", input_file]
+    if debug:
+        print(f"[DEBUG] Running duration detection: {' '.join(info_cmd)}")
+
+    try:
+        result = subprocess.run(info_cmd, capture_output=True, text=True)
+    except OSError as e:
+        if debug:
+            print(f"[DEBUG] Error extracting duration: {e}")
+        return None
+
+    if result.returncode != 0:
+        return None
+
+    # Stream entries come before the format entry; either may be N/A
+    for value in result.stdout.split():
+        try:
+            duration = float(value)
+        except ValueError:
+            continue
+        if duration > 0:
+            if debug:
+                print(f"[DEBUG] ffprobe found duration: {duration:.2f}s")
+            return duration
+    return None
+
+# Progress patterns for FFmpeg output, compiled once at import time
+# Pattern for frame number (e.g., frame=  123)
+_PROGRESS_RE = re.compile(r'frame=\s*(\d+)')
+# Pattern for duration (e.g., Duration: 00:05:23.45)
+_DURATION_RE = re.compile(r'Duration:\s*(\d+):(\d+):(\d+)(?:\.(\d+))?')
+# Pattern for time progress (e.g., time=00:01:23.45)
+_TIME_RE = re.compile(r'time=\s*(\d+):(\d+):(\d+)(?:\.(\d+))?')
+# Pattern for speed (e.g., speed=2.3x)
+_SPEED_RE = re.compile(r'speed=\s*([\d.]+)x')
+# -progress keys echoed when debugging
+_DEBUG_PROGRESS_KEYS = frozenset({'out_time', 'progress', 'speed', 'total_size'})
+
 class TranscodeProcess:
     """
     Class to manage an FFmpeg transcoding process with live output access.
@@ -405,7 +581,8 @@ class TranscodeProcess:
         command (List[str]): The FFmpeg command used to start the process
         process (subprocess.Popen): The running subprocess
         stdout_thread (threading.Thread): Thread that reads from stdout
-        stderr_thread (threading.Thread): Thread that reads from stderr
+        stderr_thread (threading.Thread): Thread that reads from stderr (on POSIX
+            a single thread reads both streams and both attributes refer to it)
         stdout_buffer (List[str]): Lines captured from stdout
         stderr_buffer (List[str]): Lines captured from stderr
         progress_callback (Callable): Function to call with progress updates
@@ -414,6 +591,11 @@ class TranscodeProcess:
         returncode (Optional[int]): The process return code, or None if still running
     """
 
+    _progress_pattern = _PROGRESS_RE
+    _duration_pattern = _DURATION_RE
+    _time_pattern = _TIME_RE
+    _speed_pattern = _SPEED_RE
+
     def __init__(self, command: List[str], progress_callback: Optional[Callable[[str, Optional[float]], None]] = None, debug: bool = False):
         """
         Initialize a new TranscodeProcess.
@@ -434,164 +616,81 @@ class TranscodeProcess:
         self.finished = False
         self.returncode = None
         self._start_time = None
-        # Improved regex patterns for more robust detection
-        # Pattern for frame number (e.g., frame=  123)
-        self._progress_pattern = re.compile(r'frame=\s*(\d+)')
-        # Pattern for duration (e.g., Duration: 00:05:23.45)
-        self._duration_pattern = re.compile(r'Duration:\s*(\d+):(\d+):(\d+)(?:\.(\d+))?')
-        # Pattern for time progress (e.g., time=00:01:23.45)
-        self._time_pattern = re.compile(r'time=\s*(\d+):(\d+):(\d+)(?:\.(\d+))?')
-        # Pattern for speed (e.g., speed=2.3x)
-        self._speed_pattern = re.compile(r'speed=\s*([\d.]+)x')
         self._total_frames = None
         self._duration_seconds = None
         self.debug = debug
 
     def _read_output(self, stream: BinaryIO, buffer: List[str], is_stderr: bool = False):
         """Read output from a stream and update the appropriate buffer."""
-        line_count = 0
-        progress_data = {}  # Store the latest progress values
-        
+        state = self._new_stream_state()
         while True:
             line = stream.readline()
             if not line:
                 break
+            self._process_line(line, buffer, is_stderr, state)
 
-            try:
-                line_str = line.decode('utf-8', errors='replace').rstrip()
-            except UnicodeDecodeError:
-                line_str = line.decode('latin-1', errors='replace').rstrip()
-
-            buffer.append(line_str)
-            line_count += 1
-
-            # Print every line for debugging if requested
-            if self.debug and line_count % 20 == 0:
-                stream_type = "STDERR" if is_stderr else "STDOUT"
-                print(f"[DEBUG] {stream_type} Line {line_count}: {line_str[:80]}")
-
-            # First check for the duration pattern in FFmpeg output
-            if self._duration_seconds is None:
-                duration_match = self._duration_pattern.search(line_str)
-                if duration_match:
-                    h, m, s, ms = (duration_match.group(1), duration_match.group(2), 
-                                  duration_match.group(3), duration_match.group(4) or '0')
-                    try:
-                        h, m, s = float(h), float(m), float(s)
-                        ms = float('0.' + ms) if ms else 0.0
-                        self._duration_seconds = h * 3600 + m * 60 + s + ms
-                        if self.debug:
-                            print(f"[DEBUG] Found duration: {h:.0f}h {m:.0f}m {s:.2f}s = {self._duration_seconds:.1f}s")
-                    except ValueError as e:
-                        if self.debug:
-                            print(f"[DEBUG] Error parsing duration: {e}")
-
-            # Process the progress information from FFmpeg's -progress output
-            # This is formatted as key=value pairs with each pair on a new line
-            if '=' in line_str:
-                try:
-                    key, value = line_str.split('=', 1)
-                    key = key.strip()
-                    value = value.strip()
-                    
-                    # Store this key-value pair
-                    progress_data[key] = value
-                    
-                    if self.debug and key in ['out_time', 'progress', 'speed', 'total_size']:
-                        print(f"[DEBUG] Progress info: {key}={value}")
-                    
-                    # If we get a "progress" marker, this is the end of a progress chunk
-                    # This is a good time to calculate and report progress
-                    if key == 'progress' and value == 'end':
-                        # End of the file, set progress to 100%
-                        if self.progress_callback:
-                            status = "Transcoding completed!"
-                            self.progress_callback(status, 1.0)
-                            if self.debug:
-                                print(f"[DEBUG] End of transcoding reached")
-                    
-                    # Check if we've accumulated enough information to calculate progress
-                    elif key == 'out_time' and self._duration_seconds and self.progress_callback:
-                        # out_time is in format HH:MM:SS.MS
-                        try:
-                            time_parts = value.split(':')
-                            if len(time_parts) == 3:
-                                h, m, s_parts = time_parts
-                                s = float(s_parts)
-                                h, m = float(h), float(m)
-                                
-                                current_seconds = h * 3600 + m * 60 + s
-                                progress_percent = min(current_seconds / self._duration_seconds, 1.0)
-                                
-                                # Create a status message with useful information
-                                speed = progress_data.get('speed', 'N/A')
-                                frame = progress_data.get('frame', 'N/A')
-                                fps = progress_data.get('fps', 'N/A')
-                                total_size = progress_data.get('total_size', 'N/A')
-                                
-                                # Calculate ETA if speed is available
-                                eta_str = "ETA: unknown"
-                                if speed != 'N/A' and speed.endswith('x'):
-                                    try:
-                                        speed_val = float(speed.rstrip('x'))
-                                        remaining = (self._duration_seconds - current_seconds) / max(speed_val, 0.1)
-                                        minutes, seconds = divmod(int(remaining), 60)
-                                        hours, minutes = divmod(minutes, 60)
-                                        eta_str = f"ETA: {hours:02d}:{minutes:02d}:{seconds:02d}"
-                                    except (ValueError, ZeroDivisionError):
-                                        pass
-                                
-                                status = (f"Time: {int(h):02d}:{int(m):02d}:{s:.2f}/{int(self._duration_seconds/3600):02d}:"
-                                          f"{int((self._duration_seconds%3600)/60):02d}:{self._duration_seconds%60:.2f}, "
-                                          f"Frame: {frame}, FPS: {fps}, Speed: {speed}, {eta_str}")
-                                
-                                # Call progress callback with calculated percentage
-                                if self.debug:
-                                    print(f"[DEBUG] Progress: {progress_percent:.1%} - {status}")
-                                
-                                self.progress_callback(status, progress_percent)
-                        except (ValueError, IndexError) as e:
-                            if self.debug:
-                                print(f"[DEBUG] Error parsing out_time: {value} - {e}")
-                
-                except Exception as e:
-                    if self.debug:
-                        print(f"[DEBUG] Error processing progress line: {line_str} - {e}")
-            
-            # As a fallback, try to extract progress from regular FFmpeg output patterns
-            # This handles the case where -progress isn't working as expected
-            elif self._duration_seconds and self.progress_callback and not is_stderr:
-                # For time pattern in normal ffmpeg output (fallback)
-                time_match = self._time_pattern.search(line_str)
-                frame_match = self._progress_pattern.search(line_str)
-                
-                if time_match:
-                    try:
-                        h, m, s, ms = (time_match.group(1), time_match.group(2), 
-                                      time_match.group(3), time_match.group(4) or '0')
-                        h, m, s = float(h), float(m), float(s)
-                        ms = float('0.' + ms) if ms else 0.0
-                        current_seconds = h * 3600 + m * 60 + s + ms
-                        progress_percent = min(current_seconds / self._duration_seconds, 1.0)
-                        
-                        if self.debug:
-                            print(f"[DEBUG] Fallback time found: {h:02.0f}:{m:02.0f}:{s:.2f} - Progress: {progress_percent:.1%}")
-                        
-                        self.progress_callback(line_str, progress_percent)
-                    except (ValueError, IndexError) as e:
-                        if self.debug:
-                            print(f"[DEBUG] Error parsing fallback time: {e}")
-
-    def _extract_duration_from_output(self, stderr_output):
+    def _drain_output(self):
         """
-        Extract the duration from the initial stderr output of FFmpeg.
+        Read stdout and stderr from one thread until both reach EOF.
 
-        FFmpeg usually outputs the duration information at the beginning when it analyzes the input file.
-        This method tries to find and extract that information.
+        A selector waits on both pipes, and whatever is ready is read and split
+        into lines, so the process needs a single reader thread instead of one
+        blocking readline() thread per stream.
         """
-        # Scan the output for duration information
-        for line in stderr_output.split('\n'):
-            duration_match = self._duration_pattern.search(line)
+        with selectors.DefaultSelector() as selector:
+            for stream, buffer, is_stderr in (
+                (self.process.stdout, self.stdout_buffer, False),
+                (self.process.stderr, self.stderr_buffer, True),
+            ):
+                selector.register(stream, selectors.EVENT_READ,
+                                  (buffer, is_stderr, self._new_stream_state(), bytearray()))
+
+            while selector.get_map():
+                for key, _ in selector.select():
+                    buffer, is_stderr, state, pending = key.data
+                    chunk = os.read(key.fd, 65536)
+                    if not chunk:
+                        # EOF; a final line without a newline is still output
+                        selector.unregister(key.fileobj)
+                        if pending:
+                            self._process_line(bytes(pending), buffer, is_stderr, state)
+                        continue
+
+                    pending += chunk
+                    start = 0
+                    end = pending.find(b'\n', start)
+                    while end != -1:
+                        self._process_line(bytes(pending[start:end + 1]), buffer, is_stderr, state)
+                        start = end + 1
+                        end = pending.find(b'\n', start)
+                    del pending[:start]
+
+    @staticmethod
+    def _new_stream_state() -> Dict[str, Any]:
+        """Create the per-stream line counter and latest -progress values."""
+        return {"line_count": 0, "progress_data": {}}
+
+    def _process_line(self, line: bytes, buffer: List[str], is_stderr: bool, state: Dict[str, Any]):
+        """Record one line of FFmpeg output and report any progress it carries."""
+        try:
+            line_str = line.decode('utf-8', errors='replace').rstrip()
+        except UnicodeDecodeError:
+            line_str = line.decode('latin-1', errors='replace').rstrip()
+
+        buffer.append(line_str)
+        state["line_count"] += 1
+        line_count = state["line_count"]
+        progress_data = state["progress_data"]
+
+        # Print every line for debugging if requested
+        if self.debug and line_count % 20 == 0:
+            stream_type = "STDERR" if is_stderr else "STDOUT"
+            print(f"[DEBUG] {stream_type} Line {line_count}: {line_str[:80]}")
+
+        # First check for the duration pattern in FFmpeg output; the
+        # substring test keeps the regex off the -progress key=value lines
+        if self._duration_seconds is None and 'Duration:' in line_str:
+            duration_match = self._duration_pattern.search(line_str)
             if duration_match:
                 h, m, s, ms = (duration_match.group(1), duration_match.group(2), 
                               duration_match.group(3), duration_match.group(4) or '0')
@@ -600,16 +699,116 @@ class TranscodeProcess:
                     ms = float('0.' + ms) if ms else 0.0
                     self._duration_seconds = h * 3600 + m * 60 + s + ms
                     if self.debug:
-                        print(f"[DEBUG] Found duration: {h:.0f}h {m:.0f}m {s:.2f}s = {self._duration_seconds:.2f}s")
-                    return True
-                except (ValueError, IndexError) as e:
+                        print(f"[DEBUG] Found duration: {h:.0f}h {m:.0f}m {s:.2f}s = {self._duration_seconds:.1f}s")
+                except ValueError as e:
                     if self.debug:
                         print(f"[DEBUG] Error parsing duration: {e}")
+
+        # Process the progress information from FFmpeg's -progress output
+        # This is formatted as key=value pairs with each pair on a new line
+        if '=' in line_str:
+            try:
+                key, value = line_str.split('=', 1)
+                key = key.strip()
+                value = value.strip()
+                
+                # Store this key-value pair
+                progress_data[key] = value
+                
+                if self.debug and key in _DEBUG_PROGRESS_KEYS:
+                    print(f"[DEBUG] Progress info: {key}={value}")
+                
+                # Keys that complete or report progress have a handler
+                handler = self._PROGRESS_HANDLERS.get(key)
+                if handler is not None:
+                    handler(self, value, progress_data)
+            
+            except Exception as e:
+                if self.debug:
+                    print(f"[DEBUG] Error processing progress line: {line_str} - {e}")
         
-        if self.debug:
-            print("[DEBUG] Could not find duration in FFmpeg output")
-        
-        return False
+        # As a fallback, try to extract progress from regular FFmpeg output patterns
+        # This handles the case where -progress isn't working as expected
+        elif self._duration_seconds and self.progress_callback and not is_stderr and 'time=' in line_str:
+            # For time pattern in normal ffmpeg output (fallback)
+            time_match = self._time_pattern.search(line_str)
+            
+            if time_match:
+                try:
+                    h, m, s, ms = (time_match.group(1), time_match.group(2), 
+                                  time_match.group(3), time_match.group(4) or '0')
+                    h, m, s = float(h), float(m), float(s)
+                    ms = float('0.' + ms) if ms else 0.0
+                    current_seconds = h * 3600 + m * 60 + s + ms
+                    progress_percent = min(current_seconds / self._duration_seconds, 1.0)
+                    
+                    if self.debug:
+                        print(f"[DEBUG] Fallback time found: {h:02.0f}:{m:02.0f}:{s:.2f} - Progress: {progress_percent:.1%}")
+                    
+                    self.progress_callback(line_str, progress_percent)
+                except (ValueError, IndexError) as e:
+                    if self.debug:
+                        print(f"[DEBUG] Error parsing fallback time: {e}")
+
+    def _handle_progress(self, value: str, progress_data: Dict[str, str]):
+        """Handle the "progress" marker that ends each -progress chunk."""
+        if value == 'end' and self.progress_callback:
+            # End of the file, set progress to 100%
+            status = "Transcoding completed!"
+            self.progress_callback(status, 1.0)
+            if self.debug:
+                print(f"[DEBUG] End of transcoding reached")
+
+    def _handle_out_time(self, value: str, progress_data: Dict[str, str]):
+        """Report progress from an out_time value (HH:MM:SS.MS)."""
+        if not (self._duration_seconds and self.progress_callback):
+            return
+
+        try:
+            time_parts = value.split(':')
+            if len(time_parts) == 3:
+                h, m, s_parts = time_parts
+                s = float(s_parts)
+                h, m = float(h), float(m)
+                
+                current_seconds = h * 3600 + m * 60 + s
+                progress_percent = min(current_seconds / self._duration_seconds, 1.0)
+                
+                # Create a status message with useful information
+                speed = progress_data.get('speed', 'N/A')
+                frame = progress_data.get('frame', 'N/A')
+                fps = progress_data.get('fps', 'N/A')
+                
+                # Calculate ETA if speed is available
+                eta_str = "ETA: unknown"
+                if speed != 'N/A' and speed.endswith('x'):
+                    try:
+                        speed_val = float(speed.rstrip('x'))
+                        remaining = (self._duration_seconds - current_seconds) / max(speed_val, 0.1)
+                        minutes, seconds = divmod(int(remaining), 60)
+                        hours, minutes = divmod(minutes, 60)
+                        eta_str = f"ETA: {hours:02d}:{minutes:02d}:{seconds:02d}"
+                    except (ValueError, ZeroDivisionError):
+                        pass
+                
+                status = (f"Time: {int(h):02d}:{int(m):02d}:{s:.2f}/{int(self._duration_seconds/3600):02d}:"
+                          f"{int((self._duration_seconds%3600)/60):02d}:{self._duration_seconds%60:.2f}, "
+                          f"Frame: {frame}, FPS: {fps}, Speed: {speed}, {eta_str}")
+                
+                # Call progress callback with calculated percentage
+                if self.debug:
+                    print(f"[DEBUG] Progress: {progress_percent:.1%} - {status}")
+                
+                self.progress_callback(status, progress_percent)
+        except (ValueError, IndexError) as e:
+            if self.debug:
+                print(f"[DEBUG] Error parsing out_time: {value} - {e}")
+
+    # -progress keys that trigger a progress report, dispatched by _process_line()
+    _PROGRESS_HANDLERS = {
+        'progress': _handle_progress,
+        'out_time': _handle_out_time,
+    }
 
     def start(self):
         """Start the FFmpeg process and output capture threads."""
@@ -626,39 +825,10 @@ class TranscodeProcess:
                 input_file = self.command[input_index + 1]
                 if self.debug:
                     print(f"[DEBUG] Extracting duration from input file: {input_file}")
-                # Run ffmpeg with just the input file to get duration information
-                try:
-                    # Use ffprobe for more reliable duration extraction
-                    info_cmd = ["ffprobe", "-v", "error", "-show_entries", 
-                               "format=duration", "-of", "default=noprint_wrappers=1:nokey=1", input_file]
-                    if self.debug:
-                        print(f"[DEBUG] Running duration detection: {' '.join(info_cmd)}")
-                    
-                    result = subprocess.run(info_cmd, capture_output=True, text=True)
-                    
-                    if result.returncode == 0 and result.stdout.strip():
-                        try:
-                            # ffprobe returns duration in seconds as a float
-                            self._duration_seconds = float(result.stdout.strip())
-                            if self.debug:
-                                print(f"[DEBUG] ffprobe found duration: {self._duration_seconds:.2f}s")
-                        except (ValueError, TypeError) as e:
-                            if self.debug:
-                                print(f"[DEBUG] Error parsing ffprobe duration: {e}")
-                    
-                    # If ffprobe fails, fall back to ffmpeg
-                    if not self._duration_seconds:
-                        if self.debug:
-                            print("[DEBUG] Falling back to ffmpeg for duration detection")
-                        info_cmd = ["ffmpeg", "-i", input_file]
-                        result = subprocess.run(info_cmd, capture_output=True, text=False)
-                        stderr_output = result.stderr.decode('utf-8', errors='replace')
-                        self._extract_duration_from_output(stderr_output)
-                
-                except Exception as e:
-                    if self.debug:
-                        print(f"[DEBUG] Error extracting duration: {e}")
-        
+                # A missing duration here is picked up from the "Duration:" line
+                # FFmpeg itself prints on stderr once the encode starts
+                self._duration_seconds = _cached_duration(input_file, self.debug)
+
         if self._duration_seconds and self.debug:
             print(f"[DEBUG] Final duration detection: {self._duration_seconds:.2f}s")
 
@@ -674,19 +844,28 @@ class TranscodeProcess:
         self.started = True
 
         # Start threads to read output
-        self.stdout_thread = threading.Thread(
-            target=self._read_output,
-            args=(self.process.stdout, self.stdout_buffer, False),
-            daemon=True
-        )
-        self.stderr_thread = threading.Thread(
-            target=self._read_output,
-            args=(self.process.stderr, self.stderr_buffer, True),
-            daemon=True
-        )
+        if os.name == "posix":
+            # One thread drains both pipes; it serves as both stream threads
+            self.stdout_thread = self.stderr_thread = threading.Thread(
+                target=self._drain_output,
+                daemon=True
+            )
+            self.stdout_thread.start()
+        else:
+            # Selectors can't wait on pipes on Windows, so use a thread per stream
+            self.stdout_thread = threading.Thread(
+                target=self._read_output,
+                args=(self.process.stdout, self.stdout_buffer, False),
+                daemon=True
+            )
+            self.stderr_thread = threading.Thread(
+                target=self._read_output,
+                args=(self.process.stderr, self.stderr_buffer, True),
+                daemon=True
+            )
 
-        self.stdout_thread.start()
-        self.stderr_thread.start()
+            self.stdout_thread.start()
+            self.stderr_thread.start()
 
         return self
 
@@ -1043,8 +1222,8 @@ def transcode(
     capabilities = None
     if capabilities_file and os.path.exists(capabilities_file):
         try:
-            with open(capabilities_file, 'r') as f:
-                capabilities = json.load(f)
+            with open(capabilities_file, 'rb') as f:
+                capabilities = json.loads(f.read())
             if not quiet:
                 print(f"Loaded capabilities from {capabilities_file}")
         except Exception as e:
@@ -1153,7 +1332,8 @@ def transcode(
 def list_presets(presets_file):
     """List all available presets with their configurations."""
     try:
-        presets = load_presets(presets_file)
+        # Listing is where every problem in the file is worth reporting
+        presets = load_presets(presets_file, fail_fast=False)
         if not presets:
             print("No presets found in the presets file.")
             return
@@ -1175,6 +1355,7 @@ def cli_main():
 
     detect_parser = subparsers.add_parser("detect", help="Detect hardware acceleration capabilities")
     detect_parser.add_argument("output", help="Path to save capabilities JSON")
+    detect_parser.add_argument("--refresh", action="store_true", help="Ignore cached results and probe the hardware again")
 
     presets_parser = subparsers.add_parser("presets", help="List available presets")
     presets_parser.add_argument("--file", default="presets.json", help="Path to presets JSON file")
@@ -1203,7 +1384,7 @@ def cli_main():
     args = parser.parse_args()
 
     if args.command == "detect":
-        caps = detect_capabilities()
+        caps = detect_capabilities(force_refresh=args.refresh)
         with open(args.output, "w") as f:
             json.dump(caps, f, indent=2)
         print(f"Capabilities saved to {args.output}")
@@ -1215,8 +1396,8 @@ def cli_main():
             sys.exit(1)
     elif args.command == "transcode":
         try:
-            with open(args.capabilities) as f:
-                caps = json.load(f)
+            with open(args.capabilities, 'rb') as f:
+                caps = json.loads(f.read())
         except (FileNotFoundError, json.JSONDecodeError) as e:
             print(f"[✗] Error loading capabilities file: {e}")
             sys.exit(1)
@@ -1,10 +1,11 @@
 """Media information extraction functionality."""
 
-import json
 import logging
 import subprocess
 from typing import Dict, Any, Optional
 
+import orjson
+
 from squishy.config import load_config
 
 logger = logging.getLogger(__name__)
@@ -38,8 +39,9 @@ def get_media_info(file_path: str) -> Dict[str, Any]:
             file_path,
         ]
 
-        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-        data = json.loads(result.stdout)
+        # ffprobe's JSON is parsed straight from the raw output bytes
+        result = subprocess.run(cmd, capture_output=True, check=True)
+        data = orjson.loads(result.stdout)
 
         # Process the raw ffprobe output into a more user-friendly format
         info = {
@@ -118,7 +120,7 @@ def get_media_info(file_path: str) -> Dict[str, Any]:
     except subprocess.CalledProcessError as e:
         logger.error(f"Error running ffprobe: {e}")
         return {"error": f"Failed to extract media information: {str(e)}"}
-    except json.JSONDecodeError as e:
+    except orjson.JSONDecodeError as e:
         logger.error(f"Error parsing ffprobe output: {e}")
         return {"error": f"Failed to parse media information: {str(e)}"}
     except Exception as e:
@@ -181,7 +183,8 @@ def _extract_hdr_info(stream: Dict[str, Any]) -> Optional[Dict[str, Any]]:
             hdr_info["max_average"] = data.get("max_average", 0)
 
     # Check for HDR10+ based on codec profile and metadata
-    if "HDR10+" in json.dumps(stream) or "hdr10plus" in json.dumps(stream).lower():
+    stream_json = orjson.dumps(stream)
+    if b"HDR10+" in stream_json or b"hdr10plus" in stream_json.lower():
         hdr_info["type"] = "HDR10+"
 
     # Check color properties for HDR indicators
@@ -1,7 +1,19 @@
 """Data models for Squishy."""
 
+import threading
+from collections import deque
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional
+from functools import cached_property
+from itertools import islice
+from typing import Deque, Dict, List, Optional
+
+# Most recent FFmpeg log lines kept in memory per job
+MAX_JOB_LOG_LINES = 1000
+
+
+def _new_job_logs(lines=()) -> Deque[str]:
+    """Create a bounded job log buffer that drops the oldest lines when full."""
+    return deque(lines, maxlen=MAX_JOB_LOG_LINES)
 
 
 @dataclass
@@ -22,6 +34,11 @@ class MediaItem:
     content_rating: Optional[str] = None
     studio: Optional[str] = None
 
+    @cached_property
+    def title_lower(self) -> str:
+        """Get the lowercased title, used for sorting and search."""
+        return self.title.lower()
+
     @property
     def display_name(self) -> str:
         """Get a display name for the media item."""
@@ -103,6 +120,11 @@ class TVShow:
     content_rating: Optional[str] = None
     studio: Optional[str] = None
 
+    @cached_property
+    def title_lower(self) -> str:
+        """Get the lowercased title, used for sorting and search."""
+        return self.title.lower()
+
     @property
     def display_name(self) -> str:
         """Get a display name for the TV show."""
@@ -140,11 +162,10 @@ class TranscodeJob:
     current_time: Optional[float] = None
     process_id: Optional[int] = None  # Store process ID for cancellation
     ffmpeg_command: Optional[str] = None  # Store the FFmpeg command for reference
-    ffmpeg_logs: List[str] = field(default_factory=list)  # Store FFmpeg logs
+    ffmpeg_logs: Deque[str] = field(default_factory=_new_job_logs)  # Store FFmpeg logs
     
     def __post_init__(self):
         """Initialize a lock for thread-safe attribute updates."""
-        import threading
         self._lock = threading.RLock()
     
     def update_progress(self, current_time: float):
@@ -167,7 +188,12 @@ class TranscodeJob:
     def update_logs(self, logs: List[str]):
         """Thread-safe update of logs."""
         with self._lock:
-            self.ffmpeg_logs = logs
+            self.ffmpeg_logs = _new_job_logs(logs)
+
+    def tail_logs(self, count: int) -> List[str]:
+        """Get the last ``count`` FFmpeg log lines."""
+        logs = self.ffmpeg_logs
+        return list(islice(logs, max(len(logs) - count, 0), None))
 
     @property
     def is_complete(self) -> bool:
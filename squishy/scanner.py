@@ -2,13 +2,17 @@
 
 import os
 import uuid
+import queue
 import logging
 import threading
 import time
 from abc import ABC, abstractmethod
-from typing import Dict, List, Optional, Tuple, Any
+from collections import Counter, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, FrozenSet, List, Optional, Tuple, Any
 
 import requests
+from requests.adapters import HTTPAdapter
 
 from squishy.models import MediaItem, Movie, Episode, TVShow
 from squishy.config import load_config
@@ -17,20 +21,72 @@ from squishy.config import load_config
 MEDIA: Dict[str, MediaItem] = {}
 TV_SHOWS: Dict[str, TVShow] = {}
 
-# Thread locks for shared dictionaries
+# Thread locks for shared dictionaries. Hold them only long enough to copy
+# or count; if both are ever needed at once, take MEDIA_LOCK first, then
+# TV_SHOWS_LOCK, to avoid deadlocks
 MEDIA_LOCK = threading.RLock()  # Use RLock to allow re-entry from the same thread
 TV_SHOWS_LOCK = threading.RLock()
 
-# Scanning status tracker
-SCAN_STATUS = {
-    "in_progress": False,
-    "source": None,
-    "started_at": None,
-    "completed_at": None,
-    "item_count": 0,
-}
+# Scanning status tracker. Each update publishes a new immutable snapshot,
+# so readers never need the lock; writers serialize on SCAN_STATUS_LOCK
+ScanSnapshot = namedtuple(
+    "ScanSnapshot", "in_progress source started_at completed_at item_count"
+)
+SCAN_STATUS = ScanSnapshot(
+    in_progress=False,
+    source=None,
+    started_at=None,
+    completed_at=None,
+    item_count=0,
+)
 SCAN_STATUS_LOCK = threading.RLock()
 
+# Bumped whenever MEDIA or TV_SHOWS changes; keys the sorted listing cache
+SCAN_VERSION = 0
+_SORTED_CACHE = {"version": None, "shows": [], "movies": []}
+_SORTED_CACHE_LOCK = threading.Lock()
+_MEDIA_IDS_CACHE = (None, frozenset())
+
+
+def _create_http_session() -> requests.Session:
+    """Create a pooled HTTP session for media server requests."""
+    session = requests.Session()
+    # Keep-alive connections are reused across scans instead of reconnecting
+    # for every request (Plex issues one request per show)
+    adapter = HTTPAdapter(
+        pool_connections=int(os.environ.get("HTTP_POOL_CONNECTIONS", 4)),
+        pool_maxsize=int(os.environ.get("HTTP_POOL_MAXSIZE", 10)),
+        max_retries=int(os.environ.get("HTTP_MAX_RETRIES", 0)),
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+# Shared session for all media server API calls
+HTTP_SESSION = _create_http_session()
+
+
+def _mark_media_changed():
+    """Invalidate listings derived from MEDIA and TV_SHOWS."""
+    global SCAN_VERSION
+    with MEDIA_LOCK:
+        SCAN_VERSION += 1
+
+
+def get_scan_version() -> int:
+    """Get a counter that changes whenever the media collection changes."""
+    return SCAN_VERSION
+
+
+def clear_media():
+    """Remove all media items and TV shows (thread-safe)."""
+    with MEDIA_LOCK:
+        MEDIA.clear()
+    with TV_SHOWS_LOCK:
+        TV_SHOWS.clear()
+    _mark_media_changed()
+
 
 def apply_path_mapping(path: str) -> str:
     """Apply path mapping to convert media server paths to local paths."""
@@ -112,6 +168,8 @@ class MediaServerScanner(ABC):
                 f"Cleared {shows_count} existing TV shows before starting {self.name} scan"
             )
 
+        _mark_media_changed()
+
     def path_exists(self, path: str) -> bool:
         """Check if path exists, respecting skip_path_check flag."""
         return self.skip_path_check or os.path.exists(path)
@@ -121,6 +179,7 @@ class MediaServerScanner(ABC):
         self.media_items.append(movie)
         with MEDIA_LOCK:
             MEDIA[movie.id] = movie
+        _mark_media_changed()
         self.stats["added_movies"] += 1
 
     def add_episode_to_collection(self, episode: Episode):
@@ -128,12 +187,14 @@ class MediaServerScanner(ABC):
         self.media_items.append(episode)
         with MEDIA_LOCK:
             MEDIA[episode.id] = episode
+        _mark_media_changed()
         self.stats["added_episodes"] += 1
 
     def add_show_to_collection(self, show_id: str, show: TVShow):
         """Add a show to the collection."""
         with TV_SHOWS_LOCK:
             TV_SHOWS[show_id] = show
+        _mark_media_changed()
 
     def log_statistics(self):
         """Log scan statistics."""
@@ -461,7 +522,7 @@ class PlexScanner(MediaServerScanner):
         section_media_items = []
 
         # Process movies with all needed metadata
-        items_response = requests.get(
+        items_response = HTTP_SESSION.get(
             f"{self.url}/library/sections/{section_id}/all",
             params={
                 "includeFields": "summary,originallyAvailableAt,rating,contentRating,thumb,art,tagline,studio,genre,director,role,year"
@@ -509,7 +570,7 @@ class PlexScanner(MediaServerScanner):
         section_media_items = []
 
         # First get all shows in the section with all needed metadata
-        shows_response = requests.get(
+        shows_response = HTTP_SESSION.get(
             f"{self.url}/library/sections/{section_id}/all",
             params={
                 "includeFields": "summary,originallyAvailableAt,rating,contentRating,thumb,art,tagline,studio,genre,director,writer,producer,role,year"
@@ -553,7 +614,7 @@ class PlexScanner(MediaServerScanner):
         episodes = []
 
         # Get episodes for this show with all required fields
-        episodes_response = requests.get(
+        episodes_response = HTTP_SESSION.get(
             f"{self.url}/library/metadata/{show_key}/allLeaves",
             params={
                 "includeFields": "summary,originallyAvailableAt,rating,contentRating,thumb,art,year,index,parentIndex"
@@ -599,7 +660,7 @@ class PlexScanner(MediaServerScanner):
     def fetch_library_sections(self) -> List[Dict]:
         """Fetch library sections from Plex server."""
         try:
-            response = requests.get(
+            response = HTTP_SESSION.get(
                 f"{self.url}/library/sections", headers=self.get_headers()
             )
             if response.status_code == 200:
@@ -656,7 +717,7 @@ class PlexScanner(MediaServerScanner):
 
         try:
             # Plex uses a different endpoint to list libraries
-            response = requests.get(
+            response = HTTP_SESSION.get(
                 f"{self.url}/library/sections", headers=self.get_headers()
             )
             if response.status_code == 200:
@@ -711,7 +772,7 @@ class JellyfinScanner(MediaServerScanner):
         enabled_library_ids = []
 
         # First get all libraries to check which ones are enabled
-        libraries_response = requests.get(
+        libraries_response = HTTP_SESSION.get(
             f"{self.url}/Library/VirtualFolders", headers=self.get_headers()
         )
 
@@ -747,7 +808,7 @@ class JellyfinScanner(MediaServerScanner):
             return movie_items
 
         for library_id in enabled_library_ids:
-            response = requests.get(
+            response = HTTP_SESSION.get(
                 f"{self.url}/Items",
                 params={
                     "IncludeItemTypes": "Movie",
@@ -857,7 +918,7 @@ class JellyfinScanner(MediaServerScanner):
             return series_items
 
         for library_id in enabled_library_ids:
-            response = requests.get(
+            response = HTTP_SESSION.get(
                 f"{self.url}/Items",
                 params={
                     "IncludeItemTypes": "Series",
@@ -958,7 +1019,7 @@ class JellyfinScanner(MediaServerScanner):
             return episode_items
 
         for library_id in enabled_library_ids:
-            response = requests.get(
+            response = HTTP_SESSION.get(
                 f"{self.url}/Items",
                 params={
                     "IncludeItemTypes": "Episode",
@@ -1051,17 +1112,21 @@ class JellyfinScanner(MediaServerScanner):
         # Get enabled library IDs
         enabled_library_ids = self.get_enabled_library_ids()
 
+        # The three item queries are independent, so issue them concurrently
+        # over the pooled session and process the results in order
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            movies_future = executor.submit(self.fetch_movies, enabled_library_ids)
+            series_future = executor.submit(self.fetch_tv_series, enabled_library_ids)
+            episodes_future = executor.submit(self.fetch_episodes, enabled_library_ids)
+
         # Process movies
-        movie_items = self.fetch_movies(enabled_library_ids)
-        self.process_movies(movie_items)
+        self.process_movies(movies_future.result())
 
         # Process TV series
-        series_items = self.fetch_tv_series(enabled_library_ids)
-        self.shows_by_id = self.process_tv_series(series_items)
+        self.shows_by_id = self.process_tv_series(series_future.result())
 
         # Process episodes
-        episode_items = self.fetch_episodes(enabled_library_ids)
-        self.process_episodes(episode_items, self.shows_by_id)
+        self.process_episodes(episodes_future.result(), self.shows_by_id)
 
         # Log statistics
         self.log_statistics()
@@ -1078,7 +1143,7 @@ class JellyfinScanner(MediaServerScanner):
         libraries = []
 
         try:
-            response = requests.get(
+            response = HTTP_SESSION.get(
                 f"{self.url}/Library/VirtualFolders", headers=self.get_headers()
             )
             if response.status_code == 200:
@@ -1135,6 +1200,20 @@ def get_media(media_id: str) -> Optional[MediaItem]:
         return MEDIA.get(media_id)
 
 
+def get_media_ids() -> FrozenSet[str]:
+    """Get the IDs of all media items, rebuilt only after the collection changes."""
+    global _MEDIA_IDS_CACHE
+    version, ids = _MEDIA_IDS_CACHE
+    if version != SCAN_VERSION:
+        # Read the version first so a change during the copy is picked up by
+        # the next call
+        version = SCAN_VERSION
+        with MEDIA_LOCK:
+            ids = frozenset(MEDIA)
+        _MEDIA_IDS_CACHE = (version, ids)
+    return ids
+
+
 def get_all_media() -> List[MediaItem]:
     """Get all media items."""
     with MEDIA_LOCK:
@@ -1179,117 +1258,159 @@ def get_shows_and_movies() -> Tuple[List[TVShow], List[MediaItem]]:
     return shows_with_episodes, valid_movies
 
 
+def get_media_counts() -> Dict[str, int]:
+    """Count movies, episodes, TV shows and total media items."""
+    # Each lock is held only for its own count, never both at once
+    with MEDIA_LOCK:
+        type_counts = Counter(item.type for item in MEDIA.values())
+        total_items = len(MEDIA)
+
+    with TV_SHOWS_LOCK:
+        shows = len(TV_SHOWS)
+
+    return {
+        "movies": type_counts["movie"],
+        "shows": shows,
+        "episodes": type_counts["episode"],
+        "total_items": total_items,
+    }
+
+
+def get_sorted_shows_and_movies() -> Tuple[List[TVShow], List[MediaItem]]:
+    """
+    Get all TV shows and movies sorted by title.
+
+    The sorted lists are rebuilt only after the media collection changes;
+    callers must not modify them.
+    """
+    with _SORTED_CACHE_LOCK:
+        # Read the version first so a change during the rebuild is picked up
+        # by the next call
+        version = SCAN_VERSION
+        if _SORTED_CACHE["version"] != version:
+            shows, movies = get_shows_and_movies()
+            shows.sort(key=lambda x: x.title_lower)
+            movies.sort(key=lambda x: x.title_lower)
+            _SORTED_CACHE.update(version=version, shows=shows, movies=movies)
+
+        return _SORTED_CACHE["shows"], _SORTED_CACHE["movies"]
+
+
+def get_shows_and_movies_page(
+    search: str = "", offset: int = 0, limit: Optional[int] = None
+) -> Tuple[List[TVShow], int, List[MediaItem], int]:
+    """
+    Get one page of TV shows and movies, sorted by title.
+
+    Items are filtered by a case-insensitive title search. Returns
+    (shows, total_shows, movies, total_movies) where the totals count all
+    matches and the lists hold at most ``limit`` items starting at ``offset``.
+    """
+    shows, movies = get_sorted_shows_and_movies()
+
+    search = search.lower()
+    if search:
+        shows = [show for show in shows if search in show.title_lower]
+        movies = [movie for movie in movies if search in movie.title_lower]
+
+    end = None if limit is None else offset + limit
+    return shows[offset:end], len(shows), movies[offset:end], len(movies)
+
+
 def get_scan_status():
     """Get the current scanning status."""
-    with SCAN_STATUS_LOCK:
-        # Return a copy to avoid race conditions with modifications after returning
-        return dict(SCAN_STATUS)
+    return SCAN_STATUS._asdict()
 
 
-def _run_scan_jellyfin(url: str, api_key: str):
-    """Run Jellyfin scan in a separate thread."""
+def _update_scan_status(**changes) -> Dict[str, Any]:
+    """Publish a new scan status snapshot and return it as a dict."""
     global SCAN_STATUS
+    with SCAN_STATUS_LOCK:
+        SCAN_STATUS = SCAN_STATUS._replace(**changes)
+        return SCAN_STATUS._asdict()
+
 
+def _run_scan(source: str, scanner: MediaServerScanner):
+    """Run a media server scan, publishing status updates as it goes."""
     # Import here to avoid circular imports
     from squishy.socket_events import emit_scan_status
 
-    # Update scan status with thread safety
-    with SCAN_STATUS_LOCK:
-        SCAN_STATUS["in_progress"] = True
-        SCAN_STATUS["source"] = "jellyfin"
-        SCAN_STATUS["started_at"] = time.time()
-        SCAN_STATUS["item_count"] = 0
-
-        # Get a copy for emitting
-        status_copy = dict(SCAN_STATUS)
-
     # Emit status update
-    emit_scan_status(status_copy)
+    emit_scan_status(
+        _update_scan_status(
+            in_progress=True, source=source, started_at=time.time(), item_count=0
+        )
+    )
 
     try:
-        scanner = JellyfinScanner(url, api_key)
         scanner.scan()
 
         # Use the number of items actually added, not the total found/scanned
-        item_count = scanner.get_added_item_count()
-
-        # Update item count with thread safety
-        with SCAN_STATUS_LOCK:
-            SCAN_STATUS["item_count"] = item_count
+        _update_scan_status(item_count=scanner.get_added_item_count())
     except Exception as e:
-        logging.error(f"Error during Jellyfin scan: {str(e)}")
+        logging.error(f"Error during {scanner.name} scan: {str(e)}")
     finally:
-        # Update completion status with thread safety
-        with SCAN_STATUS_LOCK:
-            SCAN_STATUS["in_progress"] = False
-            SCAN_STATUS["completed_at"] = time.time()
-
-            # Get a copy for emitting
-            status_copy = dict(SCAN_STATUS)
+        # Episodes may have been attached to shows after their last insert
+        _mark_media_changed()
 
         # Emit final status update
-        emit_scan_status(status_copy)
+        emit_scan_status(
+            _update_scan_status(in_progress=False, completed_at=time.time())
+        )
+
+
+def _run_scan_jellyfin(url: str, api_key: str):
+    """Run Jellyfin scan in a separate thread."""
+    _run_scan("jellyfin", JellyfinScanner(url, api_key))
 
 
 def _run_scan_plex(url: str, token: str):
     """Run Plex scan in a separate thread."""
-    global SCAN_STATUS
-
-    # Import here to avoid circular imports
-    from squishy.socket_events import emit_scan_status
+    _run_scan("plex", PlexScanner(url, token))
 
-    # Update scan status with thread safety
-    with SCAN_STATUS_LOCK:
-        SCAN_STATUS["in_progress"] = True
-        SCAN_STATUS["source"] = "plex"
-        SCAN_STATUS["started_at"] = time.time()
-        SCAN_STATUS["item_count"] = 0
 
-        # Get a copy for emitting
-        status_copy = dict(SCAN_STATUS)
+# Scans run one at a time on a dedicated worker thread, so a scan requested
+# while another is running waits instead of racing it over MEDIA/TV_SHOWS
+_SCAN_QUEUE: "queue.Queue" = queue.Queue()
+_SCAN_WORKER: Optional[threading.Thread] = None
+_SCAN_WORKER_LOCK = threading.Lock()
 
-    # Emit status update
-    emit_scan_status(status_copy)
 
-    try:
-        scanner = PlexScanner(url, token)
-        scanner.scan()  # Actually run the scan
+def _scan_worker():
+    """Run queued scans until the process exits."""
+    while True:
+        target, args = _SCAN_QUEUE.get()
+        try:
+            target(*args)
+        except Exception as e:
+            logging.error(f"Unhandled error in scan worker: {str(e)}")
+        finally:
+            _SCAN_QUEUE.task_done()
 
-        # Use the number of items actually added, not the total found/scanned
-        item_count = scanner.get_added_item_count()
 
-        # Update item count with thread safety
-        with SCAN_STATUS_LOCK:
-            SCAN_STATUS["item_count"] = item_count
-    except Exception as e:
-        logging.error(f"Error during Plex scan: {str(e)}")
-    finally:
-        # Update completion status with thread safety
-        with SCAN_STATUS_LOCK:
-            SCAN_STATUS["in_progress"] = False
-            SCAN_STATUS["completed_at"] = time.time()
+def _submit_scan(target, args) -> threading.Thread:
+    """Queue a scan on the worker thread, starting the worker if needed."""
+    global _SCAN_WORKER
 
-            # Get a copy for emitting
-            status_copy = dict(SCAN_STATUS)
+    with _SCAN_WORKER_LOCK:
+        if _SCAN_WORKER is None or not _SCAN_WORKER.is_alive():
+            _SCAN_WORKER = threading.Thread(
+                target=_scan_worker, name="squishy-scan", daemon=True
+            )
+            _SCAN_WORKER.start()
 
-        # Emit final status update
-        emit_scan_status(status_copy)
+    _SCAN_QUEUE.put((target, args))
+    return _SCAN_WORKER
 
 
 def scan_jellyfin_async(url: str, api_key: str):
-    """Start Jellyfin scan in a non-blocking thread."""
-    thread = threading.Thread(target=_run_scan_jellyfin, args=(url, api_key))
-    thread.daemon = True
-    thread.start()
-    return thread
+    """Queue a Jellyfin scan on the background scan worker."""
+    return _submit_scan(_run_scan_jellyfin, (url, api_key))
 
 
 def scan_plex_async(url: str, token: str):
-    """Start Plex scan in a non-blocking thread."""
-    thread = threading.Thread(target=_run_scan_plex, args=(url, token))
-    thread.daemon = True
-    thread.start()
-    return thread
+    """Queue a Plex scan on the background scan worker."""
+    return _submit_scan(_run_scan_plex, (url, token))
 
 
 def get_jellyfin_libraries(url: str, api_key: str) -> List[Dict[str, Any]]:
@@ -242,6 +242,7 @@ function createLibraryToggle(library) {
                        name="enabled_libraries[]" 
                        value="${library.id}" 
                        ${library.enabled ? 'checked' : ''}>
+                <input type="hidden" name="all_library_ids[]" value="${library.id}">
                 <span class="toggle-slider"></span>
                 <span class="toggle-label">${library.title}</span>
                 <small class="library-type">${library.type}</small>
@@ -303,14 +304,14 @@ function renumberMappings() {
     }
 }
 
-function detectHardwareAcceleration() {
+function detectHardwareAcceleration(force = false) {
     // Show loading message
     const hwaccelResults = document.getElementById('hwaccel-results');
     hwaccelResults.innerHTML = '<p>Detecting hardware acceleration capabilities. This may take a few moments...</p>';
     hwaccelResults.style.display = 'block';
     
     // Make API request to detect hardware acceleration
-    fetch('/admin/detect_hw_accel')
+    fetch(force ? '/admin/detect_hw_accel?force=1' : '/admin/detect_hw_accel')
         .then(response => {
             if (!response.ok) {
                 throw new Error('Network response was not ok');
@@ -665,6 +666,14 @@ document.addEventListener('DOMContentLoaded', function() {
         });
     }
     
+    // Re-run detection, bypassing the cached result
+    const refreshHwAccelButton = document.getElementById('refresh-hw-accel-button');
+    if (refreshHwAccelButton) {
+        refreshHwAccelButton.addEventListener('click', function() {
+            detectHardwareAcceleration(true);
+        });
+    }
+    
     // Set up existing capabilities editing
     setupCapabilitiesEditing();
     
@@ -1,6 +1,6 @@
-// Client-side media library with pagination
+// Media library with server-side pagination
 document.addEventListener('DOMContentLoaded', function() {
-    // State variables
+    // State variables (allShows/allMovies hold only the current page)
     let allShows = [];
     let allMovies = [];
     let currentShowPage = 1;
@@ -50,12 +50,24 @@ document.addEventListener('DOMContentLoaded', function() {
         }
     });
     
+    // Build the API URL for a page of results
+    function mediaPageUrl(page, mediaType) {
+        let url = `/api/paginated-media?page=${page}&per_page=${ITEMS_PER_PAGE}`;
+        if (searchQuery) {
+            url += `&q=${encodeURIComponent(searchQuery)}`;
+        }
+        if (mediaType) {
+            url += `&type=${mediaType}`;
+        }
+        return url;
+    }
+    
     // Load media library from API
     function loadMediaLibrary() {
         initialEmptyState.style.display = 'block';
         searchLoader.style.display = 'block';
         
-        fetch('/api/paginated-media')
+        fetch(mediaPageUrl(1))
             .then(response => response.json())
             .then(data => {
                 // Store data
@@ -104,7 +116,7 @@ document.addEventListener('DOMContentLoaded', function() {
         searchLoader.style.display = 'block';
         
         // Fetch filtered data
-        fetch(`/api/paginated-media?q=${encodeURIComponent(searchQuery)}`)
+        fetch(mediaPageUrl(1))
             .then(response => response.json())
             .then(data => {
                 // Store data
@@ -171,9 +183,7 @@ document.addEventListener('DOMContentLoaded', function() {
         
         // Calculate pagination
         const totalShowPages = Math.ceil(totalShows / ITEMS_PER_PAGE);
-        const startIdx = (currentShowPage - 1) * ITEMS_PER_PAGE;
-        const endIdx = Math.min(startIdx + ITEMS_PER_PAGE, totalShows);
-        const paginatedShows = allShows.slice(startIdx, endIdx);
+        const paginatedShows = allShows;
         
         // Update stats
         showsStats.textContent = `${totalShows} show${totalShows !== 1 ? 's' : ''} found`;
@@ -214,9 +224,7 @@ document.addEventListener('DOMContentLoaded', function() {
         
         // Calculate pagination
         const totalMoviePages = Math.ceil(totalMovies / ITEMS_PER_PAGE);
-        const startIdx = (currentMoviePage - 1) * ITEMS_PER_PAGE;
-        const endIdx = Math.min(startIdx + ITEMS_PER_PAGE, totalMovies);
-        const paginatedMovies = allMovies.slice(startIdx, endIdx);
+        const paginatedMovies = allMovies;
         
         // Update stats
         moviesStats.textContent = `${totalMovies} movie${totalMovies !== 1 ? 's' : ''} found`;
@@ -377,15 +385,33 @@ document.addEventListener('DOMContentLoaded', function() {
         
         button.addEventListener('click', function() {
             if (mediaType === 'show') {
-                currentShowPage = page;
-                renderShows();
-                // Scroll to shows section
-                showsSection.scrollIntoView({ behavior: 'smooth' });
+                fetch(mediaPageUrl(page, 'shows'))
+                    .then(response => response.json())
+                    .then(data => {
+                        currentShowPage = page;
+                        allShows = data.shows;
+                        totalShows = data.total_shows;
+                        renderShows();
+                        // Scroll to shows section
+                        showsSection.scrollIntoView({ behavior: 'smooth' });
+                    })
+                    .catch(error => {
+                        console.error('Error loading shows page:', error);
+                    });
             } else if (mediaType === 'movie') {
-                currentMoviePage = page;
-                renderMovies();
-                // Scroll to movies section
-                moviesSection.scrollIntoView({ behavior: 'smooth' });
+                fetch(mediaPageUrl(page, 'movies'))
+                    .then(response => response.json())
+                    .then(data => {
+                        currentMoviePage = page;
+                        allMovies = data.movies;
+                        totalMovies = data.total_movies;
+                        renderMovies();
+                        // Scroll to movies section
+                        moviesSection.scrollIntoView({ behavior: 'smooth' });
+                    })
+                    .catch(error => {
+                        console.error('Error loading movies page:', error);
+                    });
             }
         });
         
@@ -14,7 +14,7 @@ from typing import Dict, Optional, List, Callable, Any
 
 from squishy.config import load_config
 from squishy.models import TranscodeJob, MediaItem, Episode
-from squishy.scanner import get_media
+from squishy.scanner import get_media, get_show
 from squishy.effeffmpeg.effeffmpeg import (
     transcode as effeff_transcode,
     detect_capabilities,
@@ -35,6 +35,36 @@ JOB_QUEUE_LOCK = threading.RLock()
 RUNNING_JOBS = set()
 RUNNING_JOBS_LOCK = threading.RLock()
 
+# Bumped whenever a job is added, removed or updated; keys cached job listings
+# and wakes clients waiting for changes
+JOBS_VERSION = 0
+_JOBS_CHANGED = threading.Condition()
+
+
+def _mark_jobs_changed():
+    """Invalidate job listings built from JOBS."""
+    global JOBS_VERSION
+    with _JOBS_CHANGED:
+        JOBS_VERSION += 1
+        _JOBS_CHANGED.notify_all()
+
+
+def get_jobs_version() -> int:
+    """Get a counter that changes whenever any job changes."""
+    return JOBS_VERSION
+
+
+def wait_for_jobs_change(version: int, timeout: float) -> int:
+    """
+    Wait until the jobs version differs from ``version``.
+
+    Returns the current version, which equals ``version`` if the timeout
+    expired first.
+    """
+    with _JOBS_CHANGED:
+        _JOBS_CHANGED.wait_for(lambda: JOBS_VERSION != version, timeout)
+        return JOBS_VERSION
+
 
 def create_job(media_item: MediaItem, preset_name: str) -> TranscodeJob:
     """Create a new transcoding job."""
@@ -50,6 +80,7 @@ def create_job(media_item: MediaItem, preset_name: str) -> TranscodeJob:
     )
     with JOBS_LOCK:
         JOBS[job_id] = job
+    _mark_jobs_changed()
     logger.debug(f"Created job with id={job_id}")
     return job
 
@@ -184,8 +215,8 @@ def start_transcode(
 
     config = load_config()
 
-    if preset_name in config.presets:
-        preset = config.presets[preset_name]
+    preset = config.presets.get(preset_name)
+    if preset is not None:
         logger.debug(
             f"Preset settings: scale={preset.get('scale')}, codec={preset.get('codec')}, "
             f"container={preset.get('container')}, crf={preset.get('crf')}, bitrate={preset.get('bitrate')}"
@@ -294,6 +325,7 @@ def transcode(
     try:
         # Update status with thread safety
         job.update_status("processing")
+        _mark_jobs_changed()
         logger.debug(f"Job {job.id} status changed to processing")
 
         # Always use the configured transcode_path from config
@@ -302,10 +334,12 @@ def transcode(
         logger.info(f"Using configured transcode_path: {output_dir}")
 
         # Get the preset from config
-        if preset_name not in config.presets:
+        preset = config.presets.get(preset_name)
+        if preset is None:
             raise ValueError(f"Preset '{preset_name}' not found in configuration")
 
-        preset = config.presets[preset_name]
+        # Copy the preset so per-job overrides don't leak into the config
+        preset = dict(preset)
 
         # Get original filename without extension
         original_filename = os.path.basename(media_item.path)
@@ -359,13 +393,12 @@ def transcode(
                         status_text = f"PROGRESS: {status_text}"
 
                     # De-duplicate logs (avoid adding the same line multiple times)
-                    if not any(status_text in log for log in job.ffmpeg_logs[-20:]):
-                        if len(job.ffmpeg_logs) >= 1000:
-                            job.ffmpeg_logs.pop(
-                                0
-                            )  # Remove oldest log if we have too many
+                    # (the log buffer drops its oldest lines once full)
+                    if not any(status_text in log for log in job.tail_logs(20)):
                         job.ffmpeg_logs.append(status_text)
 
+            _mark_jobs_changed()
+
             # Emit socket update every 2 seconds
             if job.current_time and int(job.current_time) % 2 == 0:
                 try:
@@ -381,9 +414,9 @@ def transcode(
                                 "progress": job.progress,
                                 "current_time": job.current_time,
                                 "duration": job.duration,
-                                "ffmpeg_logs": job.ffmpeg_logs[-30:]
-                                if job.ffmpeg_logs
-                                else [],  # Send last 30 log lines for efficiency
+                                "ffmpeg_logs": job.tail_logs(
+                                    30
+                                ),  # Send last 30 log lines for efficiency
                             }
                         )
                 except ImportError:
@@ -415,6 +448,7 @@ def transcode(
             cmd_str = " ".join(command)
             with job._lock:
                 job.ffmpeg_logs.append(f"COMMAND: {cmd_str}")
+            _mark_jobs_changed()
 
             # Store the command in the job
             cmd_str = " ".join(command)
@@ -440,6 +474,7 @@ def transcode(
 
             # Monitor the process
             cancelled = False
+            last_output_size = job.output_size
             while not process.finished:
                 # Check if job has been cancelled
                 with job._lock:
@@ -451,42 +486,51 @@ def transcode(
                     cancelled = True
                     break
 
+                # Progress is marked by the callback; only size and log
+                # changes made here need to invalidate cached job payloads
+                changed = False
+
                 # Update output file size
                 if os.path.exists(output_path):
-                    output_size = os.path.getsize(output_path)
-                    job.update_output_size(format_file_size(output_size))
+                    output_size = format_file_size(os.path.getsize(output_path))
+                    if output_size != last_output_size:
+                        job.update_output_size(output_size)
+                        last_output_size = output_size
+                        changed = True
 
                 # Read stdout and stderr buffers from the process and add to logs
                 if process.stdout_buffer or process.stderr_buffer:
                     new_logs = []
+                    with job._lock:
+                        recent_logs = job.tail_logs(100)
 
                     # Get stdout lines first (usually less important)
                     for line in process.stdout_buffer:
                         if line.strip() and not any(
-                            line in existing for existing in job.ffmpeg_logs[-100:]
+                            line in existing for existing in recent_logs
                         ):
                             new_logs.append(f"STDOUT: {line}")
 
                     # Get stderr lines (usually more important for ffmpeg)
                     for line in process.stderr_buffer:
                         if line.strip() and not any(
-                            line in existing for existing in job.ffmpeg_logs[-100:]
+                            line in existing for existing in recent_logs
                         ):
                             new_logs.append(f"STDERR: {line}")
 
                     # Add new logs to job logs
                     if new_logs:
+                        # The log buffer keeps its size manageable by
+                        # dropping the oldest lines
                         with job._lock:
-                            # Keep the size manageable
-                            if len(job.ffmpeg_logs) + len(new_logs) > 1000:
-                                # Remove oldest logs to make room
-                                job.ffmpeg_logs = job.ffmpeg_logs[
-                                    -(1000 - len(new_logs)) :
-                                ]
                             job.ffmpeg_logs.extend(new_logs)
+                        changed = True
+
+                if changed:
+                    _mark_jobs_changed()
 
                 # Use process.poll() instead of wait with timeout to check if it's still running
-                # This avoids the TimeoutExpired exception when using eventlet's patched subprocess
+                # This avoids the TimeoutExpired exception when using gevent's patched subprocess
                 if process.process.poll() is not None:
                     # Process completed
                     process.finished = True
@@ -498,14 +542,17 @@ def transcode(
                     # Add any remaining stderr output to logs
                     if stderr:
                         new_logs = []
+                        with job._lock:
+                            recent_logs = job.tail_logs(100)
                         for line in stderr.splitlines():
                             if line.strip() and not any(
-                                line in existing for existing in job.ffmpeg_logs[-100:]
+                                line in existing for existing in recent_logs
                             ):
                                 new_logs.append(f"STDERR: {line}")
                         if new_logs:
                             with job._lock:
                                 job.ffmpeg_logs.extend(new_logs)
+                            _mark_jobs_changed()
 
                     break
 
@@ -536,6 +583,7 @@ def transcode(
             if os.path.exists(output_path):
                 output_size = os.path.getsize(output_path)
                 job.update_output_size(format_file_size(output_size))
+            _mark_jobs_changed()
 
             logger.debug(
                 f"Job {job.id} completed successfully, output: {output_path}, size: {job.output_size}"
@@ -551,8 +599,6 @@ def transcode(
             if isinstance(media_item, Episode):
                 # For episodes, we want to use the parent show's poster as the poster_url
                 # and the episode's thumbnail as the thumbnail_url
-                from squishy.scanner import get_show
-
                 show = get_show(media_item.show_id)
                 if show:
                     poster_url = show.poster_url
@@ -585,8 +631,6 @@ def transcode(
                 metadata["episode_number"] = media_item.episode_number
 
                 # Add show title to the metadata
-                from squishy.scanner import get_show
-
                 show = get_show(media_item.show_id)
                 if show:
                     metadata["show_title"] = show.title
@@ -627,6 +671,8 @@ def transcode(
             # Update logs
             job.update_logs(error_lines)
 
+        _mark_jobs_changed()
+
 
 def get_media_duration(input_path: str) -> Optional[float]:
     """Get the duration of a media file in seconds using effeffmpeg."""
@@ -758,18 +804,25 @@ def get_process_status(pid: int) -> Optional[str]:
         return None
 
 
-def detect_hw_accel(ffmpeg_path: str) -> Dict[str, Any]:
-    """Detect available hardware acceleration methods using effeffmpeg."""
-    config = load_config()
+def detect_hw_accel(
+    ffmpeg_path: str, capabilities: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """Detect available hardware acceleration methods using effeffmpeg.
 
-    # Check if we have hw_capabilities in config
-    if config.hw_capabilities:
-        capabilities = config.hw_capabilities
-        logger.info("Using hardware capabilities from config")
-    else:
-        # Use effeffmpeg's detect_capabilities with the provided ffmpeg_path
-        logger.info(f"Detecting hardware capabilities using FFmpeg at: {ffmpeg_path}")
-        capabilities = detect_capabilities(ffmpeg_path=ffmpeg_path)
+    Callers that have already run capability detection can pass its result
+    as ``capabilities`` to skip the config lookup and the probe.
+    """
+    if capabilities is None:
+        config = load_config()
+
+        # Check if we have hw_capabilities in config
+        if config.hw_capabilities:
+            capabilities = config.hw_capabilities
+            logger.info("Using hardware capabilities from config")
+        else:
+            # Use effeffmpeg's detect_capabilities with the provided ffmpeg_path
+            logger.info(f"Detecting hardware capabilities using FFmpeg at: {ffmpeg_path}")
+            capabilities = detect_capabilities(ffmpeg_path=ffmpeg_path)
 
     # Format the results to match the expected output format in the admin UI
     result = {
@@ -852,6 +905,7 @@ def cancel_job(job_id: str) -> bool:
         # Update job status if found in queue
         if job_found:
             job.update_status("cancelled")
+            _mark_jobs_changed()
             logger.info(f"Removed job {job_id} from queue")
             return True
 
@@ -862,6 +916,7 @@ def cancel_job(job_id: str) -> bool:
 
     logger.info(f"Cancelling job {job_id}")
     job.update_status("cancelled")
+    _mark_jobs_changed()
 
     # If the job has a process ID, try to terminate it directly
     process_id = None
@@ -909,6 +964,7 @@ def remove_job(job_id: str) -> bool:
         with JOBS_LOCK:
             if job_id in JOBS:
                 del JOBS[job_id]
+                _mark_jobs_changed()
                 logger.info(f"Removed job {job_id} with status {job_status}")
                 return True
             else: